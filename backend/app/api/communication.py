@@ -2,29 +2,492 @@
 Communication API endpoints for JCI Connect
 Handles email and WhatsApp message sending
 """
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from typing import Callable, Dict, Any, Optional, Tuple
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+import asyncio
+import hashlib
+import json
 import logging
+from pydantic import TypeAdapter
 
 from app.models.schemas import (
-    MessageSend, MessageResponse, ErrorResponse,
-    SMTPConfig, WhatsAppConfig, TemplatePreview
+    MessageSend, MessageResponse, ErrorResponse, TemplatePreview
 )
 from app.services.email_service import EmailService
 from app.services.whatsapp_service import WhatsAppService
+from app.core.config import settings
 from app.services.config_service import ConfigService
-from app.utils.database import get_supabase_client
+from app.services.rendering import render_template
+from app.utils.cache import TTLCache
+from app.utils.database import get_supabase_client, get_postgres_pool
+from app.domain.entities import MessageLog
+from app.interfaces.api.dependencies import get_message_log_writer
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/communication", tags=["communication"])
+router = APIRouter(
+    prefix="/api/communication",
+    tags=["communication"],
+    default_response_class=ORJSONResponse
+)
+
+# Templates and organization settings change rarely, so reads are served from
+# memory for a short while instead of hitting Supabase on every request
+_template_cache = TTLCache(ttl=60, maxsize=512)
+_settings_cache = TTLCache(ttl=30, maxsize=4)
+
+# Single-row reads used when a direct Postgres pool is configured; asyncpg
+# prepares each statement once per connection and reuses it
+_TEMPLATE_QUERY = "SELECT id::text AS id, type, content, subject FROM public.message_templates WHERE id = $1"
+_TEMPLATE_WITH_SETTINGS_QUERY = "SELECT public.get_template_with_settings($1)"
+
+# Caps on concurrent outbound sends, so traffic spikes do not overwhelm the
+# SMTP server or the Evolution API
+_smtp_semaphore = asyncio.Semaphore(10)
+_whatsapp_semaphore = asyncio.Semaphore(5)
+_SEND_ATTEMPTS = 3
+_SEND_BACKOFF_INITIAL = 0.5
+_SEND_BACKOFF_MAX = 8.0
+
+# Serialized previews, keyed by template and variables; the UI re-requests the
+# same preview repeatedly while a template is being edited
+_preview_cache = TTLCache(ttl=30, maxsize=1024)
+
+# WhatsApp status and QR codes change slowly; let clients and any CDN in front
+# reuse a response for a few seconds while it revalidates
+_WHATSAPP_CACHE_CONTROL = "max-age=5, stale-while-revalidate=10"
+
+# Built once at import so the hot /send-message path serializes straight to
+# JSON bytes instead of re-validating the response model per request
+_MESSAGE_RESPONSE_ADAPTER = TypeAdapter(MessageResponse)
+_TEMPLATE_PREVIEW_ADAPTER = TypeAdapter(TemplatePreview)
+
+# In-flight template/settings fetches, shared by concurrent requests
+_inflight_bundles: Dict[str, asyncio.Future] = {}
+
+# Services are reused for as long as their configuration is unchanged
+_MAX_CACHED_SERVICES = 8
+_email_services: Dict[bytes, EmailService] = {}
+# Close tasks for evicted email services, kept referenced until they finish
+_closing_services: set = set()
+_whatsapp_services: Dict[bytes, WhatsAppService] = {}
+
+
+async def _run_blocking(call: Callable[[], Any]) -> Any:
+    """
+    Run a blocking Supabase call in a worker thread
+    
+    supabase-py is synchronous, so awaiting it directly would stall the event
+    loop for the whole HTTP round-trip.
+    
+    Args:
+        call: Zero-argument callable, usually a query builder's ``execute``
+        
+    Returns:
+        Whatever ``call`` returns
+    """
+    return await asyncio.to_thread(call)
+
+
+async def _probe(call: Callable[[], Any]) -> Tuple[bool, Any]:
+    """
+    Run a diagnostic Supabase call, capturing failures instead of raising
+    
+    Args:
+        call: Zero-argument callable, usually a query builder's ``execute``
+        
+    Returns:
+        Tuple of (succeeded, result or exception)
+    """
+    try:
+        return True, await _run_blocking(call)
+    except Exception as e:
+        return False, e
+
+
+def _parse_template_id(template_id: str) -> Optional[UUID]:
+    """
+    Parse a template ID before it is sent to Postgres
+    
+    Args:
+        template_id: Template ID from the request
+        
+    Returns:
+        Parsed UUID, or None if the ID is malformed (no template can match it)
+    """
+    try:
+        return UUID(template_id)
+    except (TypeError, ValueError):
+        return None
+
+
+async def _get_template(supabase, template_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a message template, using the in-process cache when possible
+    
+    Args:
+        supabase: Supabase client
+        template_id: Template ID
+        
+    Returns:
+        Template row, or None if it does not exist or the ID is malformed
+    """
+    template = _template_cache.get(template_id)
+    if template is None:
+        template_uuid = _parse_template_id(template_id)
+        if template_uuid is None:
+            return None
+        
+        pool = get_postgres_pool()
+        if pool is not None:
+            row = await pool.fetchrow(_TEMPLATE_QUERY, template_uuid)
+            if row is None:
+                return None
+            template = dict(row)
+        else:
+            template_result = await _run_blocking(supabase.table("message_templates").select("id,type,content,subject").eq("id", template_id).execute)
+            if not template_result.data:
+                return None
+            template = template_result.data[0]
+        _template_cache.set(template_id, template)
+    return template
+
+
+async def _fetch_template_with_settings(
+    supabase,
+    template_id: str
+) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Fetch a template and the organization settings in a single round-trip
+    
+    Args:
+        supabase: Supabase client
+        template_id: Template ID
+        
+    Returns:
+        Tuple of (template row or None, organization settings)
+    """
+    template_uuid = _parse_template_id(template_id)
+    if template_uuid is None:
+        # Nothing can match; skip the round-trip and leave the caches alone
+        return None, {}
+    
+    pool = get_postgres_pool()
+    if pool is not None:
+        bundle = await pool.fetchval(_TEMPLATE_WITH_SETTINGS_QUERY, template_uuid) or {}
+    else:
+        bundle_result = await _run_blocking(supabase.rpc(
+            "get_template_with_settings",
+            {"p_id": template_id}
+        ).execute)
+        bundle = bundle_result.data or {}
+    
+    template = bundle.get("template")
+    org_settings = bundle.get("settings") or {}
+    if template:
+        _template_cache.set(template_id, template)
+    _settings_cache.set("org_settings", org_settings)
+    return template, org_settings
+
+
+async def _get_template_with_settings(
+    supabase,
+    template_id: str
+) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Get a template and the organization settings for sending a message
+    
+    Served from the in-process caches when possible. On a miss, concurrent
+    requests for the same template share a single fetch instead of each
+    issuing their own.
+    
+    Args:
+        supabase: Supabase client
+        template_id: Template ID
+        
+    Returns:
+        Tuple of (template row or None, organization settings)
+    """
+    template = _template_cache.get(template_id)
+    org_settings = _settings_cache.get("org_settings")
+    if template is not None and org_settings is not None:
+        return template, org_settings
+    
+    fetch = _inflight_bundles.get(template_id)
+    if fetch is None:
+        fetch = asyncio.ensure_future(_fetch_template_with_settings(supabase, template_id))
+        _inflight_bundles[template_id] = fetch
+        fetch.add_done_callback(lambda _: _inflight_bundles.pop(template_id, None))
+    
+    # Shield so one cancelled request does not cancel the fetch for the others
+    return await asyncio.shield(fetch)
+
+
+def _config_fingerprint(config_data: Dict[str, Any]) -> bytes:
+    """
+    Get a stable fingerprint for a configuration dict
+    
+    Args:
+        config_data: Configuration from organization_settings
+        
+    Returns:
+        Digest that changes whenever the configuration changes
+    """
+    encoded = json.dumps(config_data, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+
+def _get_email_service(email_config_data: Dict[str, Any]) -> EmailService:
+    """
+    Get an EmailService for the given configuration, reusing a cached one
+    
+    Args:
+        email_config_data: Email configuration from organization_settings
+        
+    Returns:
+        EmailService instance
+    """
+    fingerprint = _config_fingerprint(email_config_data)
+    email_service = _email_services.get(fingerprint)
+    if email_service is None:
+        if len(_email_services) >= _MAX_CACHED_SERVICES:
+            # Evicted services still hold an open SMTP session
+            for stale_service in _email_services.values():
+                task = asyncio.create_task(stale_service.close())
+                _closing_services.add(task)
+                task.add_done_callback(_closing_services.discard)
+            _email_services.clear()
+        email_service = EmailService(email_config_data)
+        _email_services[fingerprint] = email_service
+    return email_service
+
+
+async def close_email_services() -> None:
+    """Close the SMTP sessions of every cached email service"""
+    services = list(_email_services.values())
+    _email_services.clear()
+    await asyncio.gather(*(service.close() for service in services), *_closing_services)
+
+
+def _get_whatsapp_service(whatsapp_config_data: Dict[str, Any]) -> WhatsAppService:
+    """
+    Get a WhatsAppService for the given configuration, reusing a cached one
+    
+    Args:
+        whatsapp_config_data: WhatsApp configuration from organization_settings
+        
+    Returns:
+        WhatsAppService instance
+    """
+    fingerprint = _config_fingerprint(whatsapp_config_data)
+    whatsapp_service = _whatsapp_services.get(fingerprint)
+    if whatsapp_service is None:
+        if len(_whatsapp_services) >= _MAX_CACHED_SERVICES:
+            _whatsapp_services.clear()
+        whatsapp_service = WhatsAppService(whatsapp_config_data)
+        _whatsapp_services[fingerprint] = whatsapp_service
+    return whatsapp_service
+
+
+async def _send_with_retry(
+    semaphore: asyncio.Semaphore,
+    send: Callable[..., Any],
+    **kwargs: Any
+) -> Dict[str, Any]:
+    """
+    Run an outbound send under a concurrency cap, retrying when rate limited
+    
+    Attempts whose result is flagged ``retryable`` (HTTP 429 or a transient
+    SMTP reply) are retried with exponential backoff.
+    
+    Args:
+        semaphore: Semaphore bounding concurrent sends to the same service
+        send: Service coroutine function returning a result dict
+        **kwargs: Arguments passed to ``send``
+        
+    Returns:
+        Result dict from the last attempt
+    """
+    delay = _SEND_BACKOFF_INITIAL
+    for attempt in range(1, _SEND_ATTEMPTS + 1):
+        async with semaphore:
+            result = await send(**kwargs)
+        
+        if not result.get("retryable") or attempt == _SEND_ATTEMPTS:
+            return result
+        
+        logger.warning("Send rate limited (attempt %s/%s), retrying in %ss", attempt, _SEND_ATTEMPTS, delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, _SEND_BACKOFF_MAX)
+
+
+class _EmailHandler:
+    """Sends and previews email templates"""
+    
+    required_field = "recipient_email"
+    missing_recipient_detail = "Email recipient is required for email templates"
+    config_key = "email_config"
+    missing_config_detail = "Email configuration not found"
+    
+    async def send(
+        self,
+        config_data: Dict[str, Any],
+        message_data: MessageSend,
+        template: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Send an email rendered from the template
+        
+        Args:
+            config_data: Email configuration from organization_settings
+            message_data: Message sending data
+            template: Template row
+            
+        Returns:
+            Result dict from EmailService
+        """
+        return await _send_with_retry(
+            _smtp_semaphore,
+            _get_email_service(config_data).send_template_email,
+            to_email=message_data.recipient_email,
+            template_content=template["content"],
+            subject=template["subject"] or "Message from JCI Connect",
+            variables=message_data.variables,
+            is_html=True
+        )
+    
+    def render_subject(self, template: Dict[str, Any], variables: Dict[str, Any]) -> Optional[str]:
+        """Render the template subject"""
+        return render_template(template["subject"] or "", variables)
+
+
+class _WhatsAppHandler:
+    """Sends and previews WhatsApp templates"""
+    
+    required_field = "recipient_phone"
+    missing_recipient_detail = "Phone number is required for WhatsApp templates"
+    config_key = "whatsapp_config"
+    missing_config_detail = "WhatsApp configuration not found"
+    
+    async def send(
+        self,
+        config_data: Dict[str, Any],
+        message_data: MessageSend,
+        template: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Send a WhatsApp message rendered from the template
+        
+        Args:
+            config_data: WhatsApp configuration from organization_settings
+            message_data: Message sending data
+            template: Template row
+            
+        Returns:
+            Result dict from WhatsAppService
+        """
+        return await _send_with_retry(
+            _whatsapp_semaphore,
+            _get_whatsapp_service(config_data).send_template_message,
+            to_phone=message_data.recipient_phone,
+            template_content=template["content"],
+            variables=message_data.variables
+        )
+    
+    def render_subject(self, template: Dict[str, Any], variables: Dict[str, Any]) -> Optional[str]:
+        """WhatsApp messages have no subject"""
+        return None
+
+
+HANDLERS = {
+    "email": _EmailHandler(),
+    "whatsapp": _WhatsAppHandler()
+}
+
+
+def _get_handler(template: Dict[str, Any]):
+    """
+    Get the handler for a template's type
+    
+    Args:
+        template: Template row
+        
+    Returns:
+        Handler for the template type
+        
+    Raises:
+        HTTPException: If the template type is not supported
+    """
+    handler = HANDLERS.get(template["type"])
+    if handler is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported template type: {template['type']}"
+        )
+    return handler
+
+
+def _cacheable_response(request: Request, payload: MessageResponse) -> Response:
+    """
+    Build a briefly cacheable JSON response with an ETag
+    
+    Args:
+        request: Incoming request, checked for If-None-Match
+        payload: Response payload
+        
+    Returns:
+        304 response if the client already holds this payload, else JSON response
+    """
+    body = _MESSAGE_RESPONSE_ADAPTER.dump_json(payload)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"Cache-Control": _WHATSAPP_CACHE_CONTROL, "ETag": etag}
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _log_message(message_log: MessageLog) -> None:
+    """
+    Write a message log through the app's shared background writer
+    
+    The writer batches inserts and runs for the app's lifetime; if it is
+    not running or its queue is full, the row is inserted inline. A failed
+    write is logged rather than surfaced, as the message was already sent.
+    
+    Args:
+        message_log: Message log to write
+    """
+    message_log_writer = get_message_log_writer()
+    if message_log_writer.enqueue(message_log):
+        return
+    try:
+        await message_log_writer.repository.create(message_log)
+    except Exception as e:
+        logger.error("Failed to write message log: %s", e)
+
+
+async def get_email_service(supabase=Depends(get_supabase_client)) -> Optional[EmailService]:
+    """Get the EmailService for the current configuration, or None if SMTP is not configured"""
+    email_config = await ConfigService(supabase).get_email_config()
+    return _get_email_service(email_config) if email_config else None
+
+
+async def get_whatsapp_service(supabase=Depends(get_supabase_client)) -> Optional[WhatsAppService]:
+    """Get the WhatsAppService for the current configuration, or None if WhatsApp is not configured"""
+    whatsapp_config = await ConfigService(supabase).get_whatsapp_config()
+    return _get_whatsapp_service(whatsapp_config) if whatsapp_config else None
 
 
 @router.post("/send-message", response_model=MessageResponse)
 async def send_message(
     message_data: MessageSend,
     supabase=Depends(get_supabase_client)
-) -> MessageResponse:
+) -> Response:
     """
     Send a message using a template
     
@@ -36,106 +499,67 @@ async def send_message(
         MessageResponse with sending results
     """
     try:
-        # Get template from database
-        template_result = supabase.table("message_templates").select("*").eq("id", message_data.template_id).execute()
+        template, org_settings = await _get_template_with_settings(
+            supabase,
+            message_data.template_id
+        )
         
-        if not template_result.data:
+        if not template:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Template not found"
             )
         
-        template = template_result.data[0]
-        
-        # Get organization settings for configuration
-        settings_result = supabase.table("organization_settings").select("*").execute()
-        org_settings = settings_result.data[0] if settings_result.data else {}
-        
         # Send message based on template type
-        if template["type"] == "email":
-            if not message_data.recipient_email:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email recipient is required for email templates"
-                )
-            
-            # Get SMTP configuration
-            email_config_data = org_settings.get("email_config", {})
-            if not email_config_data:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email configuration not found"
-                )
-            
-            smtp_config = SMTPConfig(**email_config_data)
-            email_service = EmailService(smtp_config)
-            
-            # Send email
-            result = await email_service.send_template_email(
-                to_email=message_data.recipient_email,
-                template_content=template["content"],
-                subject=template["subject"] or "Message from JCI Connect",
-                variables=message_data.variables,
-                is_html=True
-            )
-            
-        elif template["type"] == "whatsapp":
-            if not message_data.recipient_phone:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Phone number is required for WhatsApp templates"
-                )
-            
-            # Get WhatsApp configuration
-            whatsapp_config_data = org_settings.get("whatsapp_config", {})
-            if not whatsapp_config_data:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="WhatsApp configuration not found"
-                )
-            
-            whatsapp_config = WhatsAppConfig(**whatsapp_config_data)
-            whatsapp_service = WhatsAppService(whatsapp_config)
-            
-            # Send WhatsApp message
-            result = await whatsapp_service.send_template_message(
-                to_phone=message_data.recipient_phone,
-                template_content=template["content"],
-                variables=message_data.variables
+        handler = _get_handler(template)
+        
+        if not getattr(message_data, handler.required_field):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=handler.missing_recipient_detail
             )
         
-        else:
+        config_data = org_settings.get(handler.config_key, {})
+        if not config_data:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported template type: {template['type']}"
+                detail=handler.missing_config_detail
             )
         
-        # Log message in database
-        log_data = {
-            "template_id": message_data.template_id,
-            "recipient_email": message_data.recipient_email,
-            "recipient_phone": message_data.recipient_phone,
-            "type": template["type"],
-            "subject": template.get("subject"),
-            "content": template["content"],
-            "variables_used": message_data.variables,
-            "status": result["status"],
-            "error_message": result.get("error"),
-            "sent_at": "now()" if result["success"] else None
-        }
+        result = await handler.send(config_data, message_data, template)
         
-        supabase.table("message_logs").insert(log_data).execute()
+        now = datetime.now(timezone.utc)
+        message_log = MessageLog(
+            id=str(uuid4()),
+            template_id=message_data.template_id,
+            recipient_email=message_data.recipient_email,
+            recipient_phone=message_data.recipient_phone,
+            type=template["type"],
+            subject=template.get("subject"),
+            content=template["content"],
+            variables_used=message_data.variables,
+            status=result["status"],
+            error_message=result.get("error"),
+            sent_at=now if result["success"] else None,
+            created_at=now
+        )
         
-        return MessageResponse(
-            success=result["success"],
-            message=result.get("message", "Message processed"),
-            data=result
+        # Log message in the writer's next batch insert
+        await _log_message(message_log)
+        
+        return Response(
+            content=_MESSAGE_RESPONSE_ADAPTER.dump_json(MessageResponse(
+                success=result["success"],
+                message=result.get("message", "Message processed"),
+                data=result
+            )),
+            media_type="application/json"
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to send message: {str(e)}")
+        logger.error("Failed to send message: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to send message: {str(e)}"
@@ -147,7 +571,7 @@ async def preview_template(
     template_id: str,
     variables: Dict[str, Any],
     supabase=Depends(get_supabase_client)
-) -> TemplatePreview:
+) -> Response:
     """
     Preview a template with variables replaced
     
@@ -157,54 +581,40 @@ async def preview_template(
         supabase: Supabase client dependency
         
     Returns:
-        TemplatePreview with rendered content
+        JSON-encoded TemplatePreview with rendered content
     """
     try:
-        # Get template from database
-        template_result = supabase.table("message_templates").select("*").eq("id", template_id).execute()
+        template = await _get_template(supabase, template_id)
         
-        if not template_result.data:
+        if not template:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Template not found"
             )
         
-        template = template_result.data[0]
+        preview_key = (template_id, json.dumps(variables, sort_keys=True, default=str))
+        body = _preview_cache.get(preview_key)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
         
         # Render template based on type
-        if template["type"] == "email":
-            email_service = EmailService()
-            rendered_content = email_service.render_template(template["content"], variables)
-            rendered_subject = email_service.render_template(template["subject"] or "", variables)
-            
-            return TemplatePreview(
-                template_id=template_id,
-                content=rendered_content,
-                subject=rendered_subject,
-                variables_used=variables
-            )
-        
-        elif template["type"] == "whatsapp":
-            whatsapp_service = WhatsAppService()
-            rendered_content = whatsapp_service.render_template(template["content"], variables)
-            
-            return TemplatePreview(
-                template_id=template_id,
-                content=rendered_content,
-                subject=None,
-                variables_used=variables
-            )
+        handler = _get_handler(template)
+        preview = TemplatePreview(
+            template_id=template_id,
+            content=render_template(template["content"], variables),
+            subject=handler.render_subject(template, variables),
+            variables_used=variables
+        )
         
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported template type: {template['type']}"
-            )
+        # Cache the serialized preview so repeat requests skip serialization too
+        body = _TEMPLATE_PREVIEW_ADAPTER.dump_json(preview)
+        _preview_cache.set(preview_key, body)
+        return Response(content=body, media_type="application/json")
             
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to preview template: {str(e)}")
+        logger.error("Failed to preview template: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to preview template: {str(e)}"
@@ -214,31 +624,26 @@ async def preview_template(
 @router.post("/test-email", response_model=MessageResponse)
 async def test_email_connection(
     test_email: str,
-    supabase=Depends(get_supabase_client)
+    email_service: Optional[EmailService] = Depends(get_email_service)
 ) -> MessageResponse:
     """
     Test SMTP email configuration from database
     
     Args:
         test_email: Email address to send test message to
-        supabase: Supabase client dependency
+        email_service: Email service for the loaded configuration
         
     Returns:
         MessageResponse with test results
     """
     try:
-        config_service = ConfigService(supabase)
-        email_config = await config_service.get_email_config()
-        
-        if not email_config:
+        if email_service is None:
             return MessageResponse(
                 success=False,
                 message="Email configuration not found in database",
                 data={"error": "No email configuration found"}
             )
         
-        email_service = EmailService(email_config)
-        
         # Test connection
         connection_result = await email_service.test_connection()
         
@@ -249,8 +654,10 @@ async def test_email_connection(
                 data=connection_result
             )
         
-        # Send test email
-        test_result = await email_service.send_email(
+        # Send test email over the session the test opened
+        test_result = await _send_with_retry(
+            _smtp_semaphore,
+            email_service.send_email,
             to_email=test_email,
             subject="JCI Connect - SMTP Test",
             content="<h1>SMTP Test Successful!</h1><p>Your email configuration is working correctly.</p>",
@@ -267,7 +674,7 @@ async def test_email_connection(
         )
         
     except Exception as e:
-        logger.error(f"Email test failed: {str(e)}")
+        logger.error("Email test failed: %s", e)
         return MessageResponse(
             success=False,
             message=f"Email test failed: {str(e)}",
@@ -278,31 +685,26 @@ async def test_email_connection(
 @router.post("/test-whatsapp", response_model=MessageResponse)
 async def test_whatsapp_connection(
     test_phone: str,
-    supabase=Depends(get_supabase_client)
+    whatsapp_service: Optional[WhatsAppService] = Depends(get_whatsapp_service)
 ) -> MessageResponse:
     """
     Test WhatsApp Evolution API configuration from database
     
     Args:
         test_phone: Phone number to send test message to
-        supabase: Supabase client dependency
+        whatsapp_service: WhatsApp service for the loaded configuration
         
     Returns:
         MessageResponse with test results
     """
     try:
-        config_service = ConfigService(supabase)
-        whatsapp_config = await config_service.get_whatsapp_config()
-        
-        if not whatsapp_config:
+        if whatsapp_service is None:
             return MessageResponse(
                 success=False,
                 message="WhatsApp configuration not found in database",
                 data={"error": "No WhatsApp configuration found"}
             )
         
-        whatsapp_service = WhatsAppService(whatsapp_config)
-        
         # Test connection
         connection_result = await whatsapp_service.test_connection()
         
@@ -314,7 +716,9 @@ async def test_whatsapp_connection(
             )
         
         # Send test message
-        test_result = await whatsapp_service.send_message(
+        test_result = await _send_with_retry(
+            _whatsapp_semaphore,
+            whatsapp_service.send_message,
             to_phone=test_phone,
             message="*JCI Connect - WhatsApp Test*\n\nYour WhatsApp configuration is working correctly!",
             message_type="text"
@@ -330,7 +734,7 @@ async def test_whatsapp_connection(
         )
         
     except Exception as e:
-        logger.error(f"WhatsApp test failed: {str(e)}")
+        logger.error("WhatsApp test failed: %s", e)
         return MessageResponse(
             success=False,
             message=f"WhatsApp test failed: {str(e)}",
@@ -340,44 +744,45 @@ async def test_whatsapp_connection(
 
 @router.get("/whatsapp/status", response_model=MessageResponse)
 async def get_whatsapp_status(
-    supabase=Depends(get_supabase_client)
-) -> MessageResponse:
+    request: Request,
+    whatsapp_service: Optional[WhatsAppService] = Depends(get_whatsapp_service)
+) -> Response:
     """
     Get WhatsApp instance status
     
+    Successful responses carry Cache-Control and ETag headers.
+    
     Args:
-        supabase: Supabase client dependency
+        request: Incoming request
+        whatsapp_service: WhatsApp service for the loaded configuration
         
     Returns:
         MessageResponse with WhatsApp status
     """
     try:
-        # Get WhatsApp configuration
-        settings_result = supabase.table("organization_settings").select("whatsapp_config").execute()
-        org_settings = settings_result.data[0] if settings_result.data else {}
-        
-        whatsapp_config_data = org_settings.get("whatsapp_config", {})
-        if not whatsapp_config_data:
+        if whatsapp_service is None:
             return MessageResponse(
                 success=False,
                 message="WhatsApp configuration not found",
                 data={"error": "No WhatsApp configuration"}
             )
         
-        whatsapp_config = WhatsAppConfig(**whatsapp_config_data)
-        whatsapp_service = WhatsAppService(whatsapp_config)
-        
         # Get status
         status_result = await whatsapp_service.get_instance_status()
         
-        return MessageResponse(
+        payload = MessageResponse(
             success=status_result["success"],
             message="WhatsApp status retrieved",
             data=status_result
         )
         
+        if not payload.success:
+            return payload
+        
+        return _cacheable_response(request, payload)
+        
     except Exception as e:
-        logger.error(f"Failed to get WhatsApp status: {str(e)}")
+        logger.error("Failed to get WhatsApp status: %s", e)
         return MessageResponse(
             success=False,
             message=f"Failed to get WhatsApp status: {str(e)}",
@@ -387,44 +792,45 @@ async def get_whatsapp_status(
 
 @router.get("/whatsapp/qr", response_model=MessageResponse)
 async def get_whatsapp_qr(
-    supabase=Depends(get_supabase_client)
-) -> MessageResponse:
+    request: Request,
+    whatsapp_service: Optional[WhatsAppService] = Depends(get_whatsapp_service)
+) -> Response:
     """
     Get WhatsApp QR code for connection
     
+    Successful responses carry Cache-Control and ETag headers.
+    
     Args:
-        supabase: Supabase client dependency
+        request: Incoming request
+        whatsapp_service: WhatsApp service for the loaded configuration
         
     Returns:
         MessageResponse with QR code data
     """
     try:
-        # Get WhatsApp configuration
-        settings_result = supabase.table("organization_settings").select("whatsapp_config").execute()
-        org_settings = settings_result.data[0] if settings_result.data else {}
-        
-        whatsapp_config_data = org_settings.get("whatsapp_config", {})
-        if not whatsapp_config_data:
+        if whatsapp_service is None:
             return MessageResponse(
                 success=False,
                 message="WhatsApp configuration not found",
                 data={"error": "No WhatsApp configuration"}
             )
         
-        whatsapp_config = WhatsAppConfig(**whatsapp_config_data)
-        whatsapp_service = WhatsAppService(whatsapp_config)
-        
         # Get QR code
         qr_result = await whatsapp_service.get_qr_code()
         
-        return MessageResponse(
+        payload = MessageResponse(
             success=qr_result["success"],
             message="WhatsApp QR code retrieved",
             data=qr_result
         )
         
+        if not payload.success:
+            return payload
+        
+        return _cacheable_response(request, payload)
+        
     except Exception as e:
-        logger.error(f"Failed to get WhatsApp QR code: {str(e)}")
+        logger.error("Failed to get WhatsApp QR code: %s", e)
         return MessageResponse(
             success=False,
             message=f"Failed to get WhatsApp QR code: {str(e)}",
@@ -432,83 +838,165 @@ async def get_whatsapp_qr(
         )
 
 
+@router.post("/admin/reload-config", response_model=MessageResponse)
+async def reload_communication_config(supabase=Depends(get_supabase_client)) -> MessageResponse:
+    """
+    Reload the communication configuration from organization settings
+    
+    Only available when DEBUG is enabled.
+    
+    Settings changes are picked up within SETTINGS_TTL on their own. This
+    drops the cached settings and the services built from them, so the
+    next request, including /send-message, uses the current configuration.
+    
+    Args:
+        supabase: Supabase client dependency
+        
+    Returns:
+        MessageResponse with which channels are configured
+    """
+    if not settings.debug:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    
+    try:
+        ConfigService.invalidate()
+        _settings_cache.clear()
+        _whatsapp_services.clear()
+        await close_email_services()
+        
+        comm_config = await ConfigService(supabase).get_communication_config()
+        
+        return MessageResponse(
+            success=True,
+            message="Communication configuration reloaded",
+            data={
+                "email_configured": comm_config.smtp is not None,
+                "whatsapp_configured": comm_config.whatsapp is not None
+            }
+        )
+        
+    except Exception as e:
+        logger.error("Failed to reload communication configuration: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to reload communication configuration: {str(e)}"
+        )
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """
+    Get hit/miss statistics for the in-process template and settings caches
+    
+    Returns:
+        Dict with per-cache statistics
+    """
+    return {
+        "templates": _template_cache.stats(),
+        "settings": _settings_cache.stats(),
+        "previews": _preview_cache.stats()
+    }
+
+
 @router.get("/test-supabase")
-async def test_supabase_connection(supabase=Depends(get_supabase_client)):
+async def test_supabase_connection(
+    check_auth: bool = False,
+    supabase=Depends(get_supabase_client)
+):
     """
     Test Supabase connection by fetching basic data
     
+    Only available when DEBUG is enabled.
+    
+    Args:
+        check_auth: Also probe Supabase Auth for a current user (an extra
+            GoTrue roundtrip; the backend normally has none)
+        supabase: Supabase client dependency
+    
     Returns:
         Dict with connection status and sample data
     """
+    if not settings.debug:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    
     try:
         logger.info("Testing Supabase connection...")
         
-        # Try to get basic info about the database
-        # First, let's try to get the current user (this tests authentication)
-        try:
-            user_result = supabase.auth.get_user()
-            user_info = {
-                "authenticated": True,
-                "user_id": user_result.user.id if user_result.user else None,
-                "email": user_result.user.email if user_result.user else None
-            }
-        except Exception as auth_error:
-            logger.info("No authenticated user (this is normal for backend)")
-            user_info = {
-                "authenticated": False,
-                "note": "Backend service - no user authentication required"
-            }
+        # The probes are independent, so run them concurrently. Table probes
+        # ask PostgREST for an exact count with zero rows, so no row data is
+        # transferred
+        probes = [
+            _probe(supabase.table("message_templates").select("id", count="exact").limit(0).execute),
+            _probe(supabase.table("organization_settings").select("id", count="exact").limit(0).execute),
+            # Profiles with service role (bypasses RLS)
+            _probe(supabase.table("profiles").select("id", count="exact").limit(0).execute)
+        ]
+        if check_auth:
+            # Current user (this tests authentication)
+            probes.append(_probe(supabase.auth.get_user))
         
-        # Try to access a simple table - let's check if we can list tables
-        # We'll try to access the message_templates table
-        try:
-            templates_result = supabase.table("message_templates").select("id").limit(1).execute()
+        (
+            (templates_ok, templates_result),
+            (org_ok, org_result),
+            (profiles_ok, profiles_result),
+            *auth_probe
+        ) = await asyncio.gather(*probes)
+        
+        user_info = {
+            "authenticated": False,
+            "note": "Backend service - no user authentication required"
+        }
+        if auth_probe:
+            user_ok, user_result = auth_probe[0]
+            if user_ok:
+                user_info = {
+                    "authenticated": True,
+                    "user_id": user_result.user.id if user_result.user else None,
+                    "email": user_result.user.email if user_result.user else None
+                }
+            else:
+                logger.info("No authenticated user (this is normal for backend)")
+        
+        if templates_ok:
             table_access = {
                 "message_templates_accessible": True,
-                "template_count": len(templates_result.data) if templates_result.data else 0
+                "template_count": templates_result.count or 0
             }
-        except Exception as table_error:
-            logger.warning(f"Could not access message_templates table: {str(table_error)}")
+        else:
+            logger.warning("Could not access message_templates table: %s", templates_result)
             table_access = {
                 "message_templates_accessible": False,
-                "error": str(table_error)
+                "error": str(templates_result)
             }
         
-        # Try to access organization_settings table
-        try:
-            org_result = supabase.table("organization_settings").select("id").limit(1).execute()
+        if org_ok:
             org_access = {
                 "organization_settings_accessible": True,
-                "settings_count": len(org_result.data) if org_result.data else 0
+                "settings_count": org_result.count or 0
             }
-        except Exception as org_error:
-            logger.warning(f"Could not access organization_settings table: {str(org_error)}")
+        else:
+            logger.warning("Could not access organization_settings table: %s", org_result)
             org_access = {
                 "organization_settings_accessible": False,
-                "error": str(org_error)
+                "error": str(org_result)
             }
         
-        # Try to access profiles table
-        try:
-            # Try to access profiles with service role (bypasses RLS)
-            profiles_result = supabase.table("profiles").select("*").execute()
+        if profiles_ok:
             profiles_access = {
                 "profiles_accessible": True,
-                "profiles_count": len(profiles_result.data) if profiles_result.data else 0,
-                "profiles_data": profiles_result.data if profiles_result.data else [],
+                "profiles_count": profiles_result.count or 0,
                 "note": "Using service role key - should bypass RLS policies"
             }
             
             # If no data returned, it might be due to RLS policies
-            if not profiles_result.data:
+            if not profiles_result.count:
                 logger.info("No profiles data returned - this might be due to RLS policies")
                 profiles_access["note"] += " - No data returned, likely due to RLS policies"
-                
-        except Exception as profiles_error:
-            logger.warning(f"Could not access profiles table: {str(profiles_error)}")
+        else:
+            logger.warning("Could not access profiles table: %s", profiles_result)
             profiles_access = {
                 "profiles_accessible": False,
-                "error": str(profiles_error)
+                "error": str(profiles_result)
             }
         
         return {
@@ -525,7 +1013,7 @@ async def test_supabase_connection(supabase=Depends(get_supabase_client)):
         }
         
     except Exception as e:
-        logger.error(f"Supabase connection test failed: {str(e)}")
+        logger.error("Supabase connection test failed: %s", e)
         return {
             "success": False,
             "message": f"Supabase connection test failed: {str(e)}",
@@ -539,111 +1027,30 @@ async def test_profiles_access(supabase=Depends(get_supabase_client)):
     """
     Test direct access to profiles table with RLS bypass
     
+    Only available when DEBUG is enabled.
+    
     Returns:
         Dict with profiles data and access details
     """
+    if not settings.debug:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    
     try:
         logger.info("Testing direct profiles access with RLS analysis...")
         
-        # Try different approaches to access profiles
-        results = {}
-        
-        # Approach 1: Basic select (should be blocked by RLS)
-        try:
-            basic_result = supabase.table("profiles").select("*").execute()
-            results["basic_select"] = {
-                "success": True,
-                "count": len(basic_result.data) if basic_result.data else 0,
-                "data": basic_result.data if basic_result.data else [],
-                "note": "Basic select - may be blocked by RLS"
-            }
-        except Exception as e:
-            results["basic_select"] = {
-                "success": False,
-                "error": str(e),
-                "note": "Basic select failed - likely RLS blocking"
-            }
-        
-        # Approach 2: Try to authenticate as service role with explicit headers
-        try:
-            # Try to set the role explicitly in the request
-            service_result = supabase.table("profiles").select("*").execute()
-            results["service_role_select"] = {
-                "success": True,
-                "count": len(service_result.data) if service_result.data else 0,
-                "data": service_result.data if service_result.data else [],
-                "note": "Service role select - should bypass RLS"
-            }
-        except Exception as e:
-            results["service_role_select"] = {
-                "success": False,
-                "error": str(e),
-                "note": "Service role select failed"
-            }
-        
-        # Approach 2b: Try to use SQL function to bypass RLS
-        try:
-            # Try to execute the SQL function that bypasses RLS
-            function_result = supabase.rpc('get_profiles_for_service_role').execute()
-            results["function_select"] = {
-                "success": True,
-                "count": len(function_result.data) if function_result.data else 0,
-                "data": function_result.data if function_result.data else [],
-                "note": "SQL function select - should bypass RLS with SECURITY DEFINER"
-            }
-        except Exception as e:
-            results["function_select"] = {
-                "success": False,
-                "error": str(e),
-                "note": "SQL function select failed - function may not exist yet"
-            }
-        
-        # Approach 2c: Try to get profiles count using function
-        try:
-            # Try to get count using the count function
-            count_result = supabase.rpc('get_profiles_count').execute()
-            results["count_function"] = {
-                "success": True,
-                "count": count_result.data if isinstance(count_result.data, int) else (count_result.data[0] if count_result.data and len(count_result.data) > 0 else 0),
-                "note": "Count function - should bypass RLS"
-            }
-        except Exception as e:
-            results["count_function"] = {
-                "success": False,
-                "error": str(e),
-                "note": "Count function failed - function may not exist yet"
-            }
-        
-        # Approach 3: Check if we can access auth.users to understand the issue
-        try:
-            # Try to access auth.users to see if we can get user info
-            auth_result = supabase.table("auth.users").select("id, email").limit(1).execute()
-            results["auth_users_access"] = {
-                "success": True,
-                "count": len(auth_result.data) if auth_result.data else 0,
-                "data": auth_result.data if auth_result.data else [],
-                "note": "Auth users access - checking if we can see users"
-            }
-        except Exception as e:
-            results["auth_users_access"] = {
-                "success": False,
-                "error": str(e),
-                "note": "Auth users access failed - this is expected"
-            }
-        
-        # Approach 4: Try to get current user info
+        # All probes run server-side in one SECURITY DEFINER function call
         try:
-            user_info = supabase.auth.get_user()
-            results["current_user"] = {
+            diagnostics_result = await _run_blocking(supabase.rpc("get_access_diagnostics").execute)
+            results = {
                 "success": True,
-                "user": user_info.user.dict() if user_info.user else None,
-                "note": "Current authenticated user info"
+                "diagnostics": diagnostics_result.data,
+                "note": "Access diagnostics collected with SECURITY DEFINER"
             }
         except Exception as e:
-            results["current_user"] = {
+            results = {
                 "success": False,
                 "error": str(e),
-                "note": "No authenticated user - this is expected for backend service"
+                "note": "Diagnostics function failed - function may not exist yet"
             }
         
         return {
@@ -663,7 +1070,7 @@ async def test_profiles_access(supabase=Depends(get_supabase_client)):
         }
         
     except Exception as e:
-        logger.error(f"Profiles access test failed: {str(e)}")
+        logger.error("Profiles access test failed: %s", e)
         return {
             "success": False,
             "message": f"Profiles access test failed: {str(e)}",
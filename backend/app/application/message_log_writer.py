@@ -0,0 +1,105 @@
+"""
+Background writer for message logs
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from app.application.ports.message_log_repository import MessageLogRepository
+from app.domain.entities import MessageLog
+
+logger = logging.getLogger(__name__)
+
+
+class MessageLogWriter:
+    """Queues message logs and writes them in batches off the request path"""
+    
+    def __init__(
+        self,
+        repository: MessageLogRepository,
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+        max_queue_size: int = 10000
+    ):
+        """
+        Initialize the writer
+        
+        Args:
+            repository: Repository the batches are written to
+            batch_size: Maximum number of logs per insert
+            flush_interval: Seconds to wait for more logs before flushing a partial batch
+            max_queue_size: Maximum number of logs waiting to be written
+        """
+        self.repository = repository
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def running(self) -> bool:
+        """Whether the background task is accepting logs"""
+        return self._task is not None and not self._task.done()
+    
+    def start(self) -> None:
+        """Start the background task"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Write any queued logs and stop the background task"""
+        if self.running:
+            await self._queue.put(None)
+            await self._task
+        self._task = None
+    
+    def enqueue(self, message_log: MessageLog) -> bool:
+        """
+        Queue a message log for writing
+        
+        Args:
+            message_log: Message log to write
+        
+        Returns:
+            True if queued, False if the writer is not running or the queue is full
+        """
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(message_log)
+        except asyncio.QueueFull:
+            return False
+        return True
+    
+    async def _run(self) -> None:
+        """Collect queued logs into batches and write them until stopped"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            message_log = await self._queue.get()
+            if message_log is None:
+                break
+            
+            batch = [message_log]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    message_log = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if message_log is None:
+                    stopping = True
+                    break
+                batch.append(message_log)
+            
+            await self._flush(batch)
+    
+    async def _flush(self, batch: list[MessageLog]) -> None:
+        """Write one batch, logging rather than raising on failure"""
+        try:
+            await self.repository.create_many(batch)
+        except Exception as e:
+            logger.error("Failed to write %d message logs: %s", len(batch), e)
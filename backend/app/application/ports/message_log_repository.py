@@ -1,17 +1,23 @@
 """
 Message log repository port (interface)
 """
-from typing import Protocol, Optional, Dict, Any
+from __future__ import annotations
+
+from typing import Protocol, Optional, AsyncIterator
 from app.domain.entities import MessageLog
 
 
 class MessageLogRepository(Protocol):
     """Repository for managing message logs"""
     
-    async def create(self, message_log: Dict[str, Any]) -> MessageLog:
+    async def create(self, message_log: MessageLog) -> MessageLog:
         """Create a new message log"""
         ...
     
+    async def create_many(self, message_logs: list[MessageLog]) -> list[MessageLog]:
+        """Create several message logs in one write"""
+        ...
+    
     async def get_by_id(self, log_id: str) -> Optional[MessageLog]:
         """Get message log by ID"""
         ...
@@ -19,4 +25,8 @@ class MessageLogRepository(Protocol):
     async def get_by_template_id(self, template_id: str) -> list[MessageLog]:
         """Get message logs by template ID"""
         ...
+    
+    def aiter_by_template_id(self, template_id: str, chunk_size: int = 500) -> AsyncIterator[MessageLog]:
+        """Iterate over message logs by template ID, fetching chunk_size rows at a time"""
+        ...
 
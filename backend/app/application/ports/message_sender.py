@@ -1,18 +1,25 @@
 """
 Message sender port (interface)
 """
-from typing import Protocol, Dict, Any, Optional
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol, Dict, Any, Optional
 from app.domain.value_objects import SMTPConfig, WhatsAppConfig
 
+if TYPE_CHECKING:
+    from jinja2 import Template
+
 
 class MessageSender(Protocol):
     """Interface for sending messages"""
     
+    __slots__ = ()
+    
     async def send(
         self,
         recipient: str,
-        content: str,
-        subject: Optional[str],
+        content: str | Template,
+        subject: Optional[str | Template],
         variables: Dict[str, Any],
         config: SMTPConfig | WhatsAppConfig
     ) -> Dict[str, Any]:
@@ -21,8 +28,8 @@ class MessageSender(Protocol):
         
         Args:
             recipient: Recipient identifier (email or phone)
-            content: Message content
-            subject: Message subject (for email)
+            content: Message content, as source or a precompiled template
+            subject: Message subject (for email), as source or a precompiled template
             variables: Variables to replace in content
             config: Configuration (SMTP or WhatsApp)
             
@@ -30,4 +37,26 @@ class MessageSender(Protocol):
             Dict with success status and details
         """
         ...
-
+    
+    async def send_many(
+        self,
+        recipients: list[str],
+        content: str | Template,
+        subject: Optional[str | Template],
+        variables: Dict[str, Any],
+        config: SMTPConfig | WhatsAppConfig
+    ) -> list[Dict[str, Any]]:
+        """
+        Send the same message to several recipients
+        
+        Args:
+            recipients: Recipient identifiers (emails or phones)
+            content: Message content, as source or a precompiled template
+            subject: Message subject (for email), as source or a precompiled template
+            variables: Variables to replace in content, shared by all recipients
+            config: Configuration (SMTP or WhatsApp)
+            
+        Returns:
+            One result dict per recipient, in order
+        """
+        ...
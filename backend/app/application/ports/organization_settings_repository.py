@@ -1,8 +1,11 @@
 """
 Organization settings repository port (interface)
 """
+from __future__ import annotations
+
 from typing import Protocol, Optional, Dict, Any
 from app.domain.entities import OrganizationSettings
+from app.domain.value_objects import SMTPConfig, WhatsAppConfig
 
 
 class OrganizationSettingsRepository(Protocol):
@@ -23,4 +26,12 @@ class OrganizationSettingsRepository(Protocol):
     async def get_whatsapp_config(self) -> Optional[Dict[str, Any]]:
         """Get WhatsApp configuration"""
         ...
+    
+    async def get_smtp_config(self) -> Optional[SMTPConfig]:
+        """Get the validated SMTP configuration, or None if not configured"""
+        ...
+    
+    async def get_whatsapp_api_config(self) -> Optional[WhatsAppConfig]:
+        """Get the validated WhatsApp configuration, or None if not configured"""
+        ...
 
@@ -1,6 +1,8 @@
 """
 Template repository port (interface)
 """
+from __future__ import annotations
+
 from typing import Protocol, Optional
 from app.domain.entities import Template
 
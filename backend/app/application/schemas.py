@@ -2,17 +2,26 @@
 Request and response schemas for the application layer
 """
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, Field
+
+from app.domain.value_objects import EmailAddress
 
 
 class SendMessageRequest(BaseModel):
     """Schema for sending a message"""
     template_id: str
-    recipient_email: Optional[EmailStr] = None
+    recipient_email: Optional[EmailAddress] = None
     recipient_phone: Optional[str] = None
     variables: Dict[str, Any] = Field(default_factory=dict)
 
 
+class SendBatchRequest(BaseModel):
+    """Schema for sending one template to many recipients"""
+    template_id: str
+    recipients: List[str] = Field(..., min_length=1)
+    variables_per_recipient: Optional[List[Dict[str, Any]]] = None
+
+
 class MessageResponse(BaseModel):
     """Standard API response schema"""
     success: bool
@@ -3,13 +3,19 @@ Use case for previewing templates with variables
 """
 import logging
 from typing import Dict, Any
-from jinja2 import Template
 
 from app.domain.exceptions import TemplateNotFoundError
 from app.application.ports.template_repository import TemplateRepository
+from app.infrastructure.templating import render
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Templates fetched for previews, shared across requests. Previews are
+# re-requested on every keystroke in the editor, so a short TTL spares the
+# database while keeping edits visible quickly
+_template_cache = TTLCache(ttl=10, maxsize=256)
+
 
 class PreviewTemplateUseCase:
     """Use case for previewing templates"""
@@ -17,15 +23,6 @@ class PreviewTemplateUseCase:
     def __init__(self, template_repository: TemplateRepository):
         self.template_repository = template_repository
     
-    def render_template(self, template_content: str, variables: Dict[str, Any]) -> str:
-        """Render template with variables"""
-        try:
-            template = Template(template_content)
-            return template.render(**variables)
-        except Exception as e:
-            logger.error(f"Failed to render template: {str(e)}")
-            raise ValueError(f"Template rendering failed: {str(e)}")
-    
     async def execute(self, template_id: str, variables: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Preview a template with variables replaced
@@ -44,13 +41,16 @@ class PreviewTemplateUseCase:
             variables = {}
         
         # Get template
-        template = await self.template_repository.get_by_id(template_id)
-        if not template:
-            raise TemplateNotFoundError(f"Template with id {template_id} not found")
+        template = _template_cache.get(template_id)
+        if template is None:
+            template = await self.template_repository.get_by_id(template_id)
+            if not template:
+                raise TemplateNotFoundError(f"Template with id {template_id} not found")
+            _template_cache.set(template_id, template)
         
         # Render content
-        rendered_content = self.render_template(template.content, variables)
-        rendered_subject = self.render_template(template.subject or "", variables) if template.subject else None
+        rendered_content = render(template.content, variables)
+        rendered_subject = render(template.subject, variables) if template.subject else None
         
         return {
             "template_id": template_id,
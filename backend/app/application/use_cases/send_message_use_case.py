@@ -1,11 +1,14 @@
 """
 Use case for sending messages via email or WhatsApp
 """
+import asyncio
 import logging
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, Awaitable, Callable, List, NamedTuple, Optional, Tuple, Union
+from datetime import datetime, timezone
+from uuid import uuid4
+from jinja2 import Template as JinjaTemplate, TemplateSyntaxError
 
-from app.domain.entities import Template
+from app.domain.entities import Template, MessageLog
 from app.domain.exceptions import (
     TemplateNotFoundError,
     ConfigurationNotFoundError,
@@ -15,28 +18,80 @@ from app.domain.exceptions import (
 from app.application.ports.message_sender import MessageSender
 from app.application.ports.template_repository import TemplateRepository
 from app.application.ports.message_log_repository import MessageLogRepository
+from app.application.message_log_writer import MessageLogWriter
 from app.application.ports.organization_settings_repository import OrganizationSettingsRepository
-from app.domain.value_objects import SMTPConfig, WhatsAppConfig, MessageStatus
+from app.domain.value_objects import SMTPConfig, WhatsAppConfig, MessageStatus, TemplateType
+from app.infrastructure.templating import compile_template
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SUBJECT = "Message from JCI Connect"
+
+
+class _Channel(NamedTuple):
+    """How messages for one template type are sent"""
+    name: str
+    sender: MessageSender
+    get_config: Callable[[], Awaitable[Optional[Union[SMTPConfig, WhatsAppConfig]]]]
+    missing_recipient: str
+
+
+def _compile(template: Template) -> Tuple[Union[str, JinjaTemplate], Union[str, JinjaTemplate]]:
+    """
+    Compile a template's content and subject
+    
+    Invalid source is returned as-is so the sender reports the rendering
+    failure in its result.
+    
+    Args:
+        template: Template entity
+        
+    Returns:
+        Tuple of (content, subject)
+    """
+    content = template.content
+    subject = template.subject or DEFAULT_SUBJECT
+    try:
+        return compile_template(content), compile_template(subject)
+    except TemplateSyntaxError:
+        return content, subject
+
 
 class SendMessageUseCase:
     """Use case for sending messages"""
     
+    # Upper bound on concurrent sends within one batch
+    BATCH_CONCURRENCY = 10
+    
     def __init__(
         self,
         template_repository: TemplateRepository,
         message_log_repository: MessageLogRepository,
         organization_settings_repository: OrganizationSettingsRepository,
         email_sender: MessageSender,
-        whatsapp_sender: MessageSender
+        whatsapp_sender: MessageSender,
+        message_log_writer: Optional[MessageLogWriter] = None
     ):
         self.template_repository = template_repository
         self.message_log_repository = message_log_repository
         self.organization_settings_repository = organization_settings_repository
         self.email_sender = email_sender
         self.whatsapp_sender = whatsapp_sender
+        self.message_log_writer = message_log_writer
+        self._channels = {
+            TemplateType.EMAIL: _Channel(
+                "Email",
+                email_sender,
+                organization_settings_repository.get_smtp_config,
+                "Email recipient is required for email templates"
+            ),
+            TemplateType.WHATSAPP: _Channel(
+                "WhatsApp",
+                whatsapp_sender,
+                organization_settings_repository.get_whatsapp_api_config,
+                "Phone number is required for WhatsApp templates"
+            )
+        }
     
     async def execute(
         self,
@@ -66,75 +121,232 @@ class SendMessageUseCase:
         if variables is None:
             variables = {}
         
-        # Get template
-        template = await self.template_repository.get_by_id(template_id)
+        # Get template and channel configurations concurrently
+        template, configs = await asyncio.gather(
+            self.template_repository.get_by_id(template_id),
+            self._get_configs()
+        )
         if not template:
             raise TemplateNotFoundError(f"Template with id {template_id} not found")
-        
-        # Get organization settings
-        settings = await self.organization_settings_repository.get_settings()
-        if not settings:
+        if configs is None:
             raise ConfigurationNotFoundError("Organization settings not found")
         
+        # Check the recipient for the template type before its configuration
+        channel = self._get_channel(template)
+        is_email = template.type is TemplateType.EMAIL
+        recipient = recipient_email if is_email else recipient_phone
+        if not recipient:
+            raise ValueError(channel.missing_recipient)
+        config = self._get_config(template, configs)
+        
+        # Compile once up front so senders only render
+        if variables:
+            content, subject = _compile(template)
+        else:
+            content, subject = template.content, template.subject or DEFAULT_SUBJECT
+        
         # Send message based on template type
-        result = {}
+        result = await channel.sender.send(recipient, content, subject if is_email else None, variables, config)
+        
+        # Log message in the background when a writer is running, else inline
+        message_log = self._build_log(template, recipient_email, recipient_phone, variables, result)
+        if not self._enqueue_log(message_log):
+            await self.message_log_repository.create(message_log)
         
-        if template.type.value == "email":
-            if not recipient_email:
-                raise ValueError("Email recipient is required for email templates")
+        return {
+            "success": result.get("success", False),
+            "message": result.get("message", "Message processed"),
+            "data": result
+        }
+    
+    async def execute_batch(
+        self,
+        template_id: str,
+        recipients: List[str],
+        variables_per_recipient: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send one template to many recipients
+        
+        The template and configuration are fetched and the template compiled
+        once; sends run concurrently (bounded by BATCH_CONCURRENCY) and all
+        message logs are written with a single insert.
+        
+        Args:
+            template_id: Template ID to use
+            recipients: Recipient emails (email templates) or phones (WhatsApp templates)
+            variables_per_recipient: Variables for each recipient, in the same order
             
-            email_config = await self.organization_settings_repository.get_email_config()
-            if not email_config:
-                raise ConfigurationNotFoundError("Email configuration not found")
+        Returns:
+            Dict with success status, counts and per-recipient results
             
-            smtp_config = SMTPConfig(**email_config)
-            result = await self.email_sender.send(
-                recipient_email,
-                template.content,
-                template.subject or "Message from JCI Connect",
-                variables,
-                smtp_config
-            )
+        Raises:
+            TemplateNotFoundError: If template not found
+            ConfigurationNotFoundError: If configuration not found
+            InvalidTemplateTypeError: If template type is invalid
+        """
+        if variables_per_recipient is None:
+            variables_per_recipient = [{} for _ in recipients]
+        if len(variables_per_recipient) != len(recipients):
+            raise ValueError("variables_per_recipient must match recipients in length")
+        
+        # Get template and channel configurations concurrently
+        template, configs = await asyncio.gather(
+            self.template_repository.get_by_id(template_id),
+            self._get_configs()
+        )
+        if not template:
+            raise TemplateNotFoundError(f"Template with id {template_id} not found")
+        if configs is None:
+            raise ConfigurationNotFoundError("Organization settings not found")
         
-        elif template.type.value == "whatsapp":
-            if not recipient_phone:
-                raise ValueError("Phone number is required for WhatsApp templates")
+        sender = self._get_channel(template).sender
+        config = self._get_config(template, configs)
+        compiled_content, compiled_subject = _compile(template)
+        is_email = template.type is TemplateType.EMAIL
+        
+        def message_for(variables: Dict[str, Any]) -> Tuple[Any, Any]:
+            if variables:
+                content, subject = compiled_content, compiled_subject
+            else:
+                content, subject = template.content, template.subject or DEFAULT_SUBJECT
+            return content, subject if is_email else None
+        
+        if recipients and all(variables == variables_per_recipient[0] for variables in variables_per_recipient):
+            # Every recipient gets the same message, which the sender can
+            # render and encode once
+            content, subject = message_for(variables_per_recipient[0])
+            results = await sender.send_many(recipients, content, subject, variables_per_recipient[0], config)
+        else:
+            semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
             
-            whatsapp_config = await self.organization_settings_repository.get_whatsapp_config()
-            if not whatsapp_config:
-                raise ConfigurationNotFoundError("WhatsApp configuration not found")
+            async def send_one(recipient: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+                content, subject = message_for(variables)
+                async with semaphore:
+                    return await sender.send(recipient, content, subject, variables, config)
             
-            wa_config = WhatsAppConfig(**whatsapp_config)
-            result = await self.whatsapp_sender.send(
-                recipient_phone,
-                template.content,
-                None,
+            results = await asyncio.gather(*(
+                send_one(recipient, variables)
+                for recipient, variables in zip(recipients, variables_per_recipient)
+            ))
+        
+        # Log all messages, in the background when possible, else in one insert
+        message_logs = [
+            self._build_log(
+                template,
+                recipient if is_email else None,
+                None if is_email else recipient,
                 variables,
-                wa_config
+                result
             )
+            for recipient, variables, result in zip(recipients, variables_per_recipient, results)
+        ]
+        unqueued = [message_log for message_log in message_logs if not self._enqueue_log(message_log)]
+        if unqueued:
+            await self.message_log_repository.create_many(unqueued)
         
-        else:
-            raise InvalidTemplateTypeError(f"Unsupported template type: {template.type}")
-        
-        # Log message
-        message_log = {
-            "template_id": template_id,
-            "recipient_email": recipient_email,
-            "recipient_phone": recipient_phone,
-            "type": template.type.value,
-            "subject": template.subject,
-            "content": template.content,
-            "variables_used": variables,
-            "status": result.get("status", MessageStatus.FAILED),
-            "error_message": result.get("error"),
-            "sent_at": datetime.now() if result.get("success") else None
+        sent = sum(1 for result in results if result.get("success"))
+        return {
+            "success": sent == len(results),
+            "message": f"Sent {sent} of {len(results)} messages",
+            "sent": sent,
+            "failed": len(results) - sent,
+            "results": results
         }
+    
+    async def _get_configs(self) -> Optional[Dict[TemplateType, Any]]:
+        """
+        Get the validated configuration of every channel
         
-        await self.message_log_repository.create(message_log)
+        All of them come from the repository's cached settings, so this is
+        one fetch at most. A channel whose stored config fails validation
+        maps to the error, which is raised only when that channel is used.
         
-        return {
-            "success": result.get("success", False),
-            "message": result.get("message", "Message processed"),
-            "data": result
-        }
-
+        Returns:
+            Configuration, None or validation error per template type, or
+            None if there are no organization settings
+        """
+        settings, *configs = await asyncio.gather(
+            self.organization_settings_repository.get_settings(),
+            *(channel.get_config() for channel in self._channels.values()),
+            return_exceptions=True
+        )
+        if isinstance(settings, Exception):
+            raise settings
+        if not settings:
+            return None
+        return dict(zip(self._channels, configs))
+    
+    def _get_channel(self, template: Template) -> _Channel:
+        """
+        Get the channel for a template's type
+        
+        Args:
+            template: Template entity
+            
+        Returns:
+            Channel entry from the dispatch table
+            
+        Raises:
+            InvalidTemplateTypeError: If template type is invalid
+        """
+        channel = self._channels.get(template.type)
+        if channel is None:
+            raise InvalidTemplateTypeError(f"Unsupported template type: {template.type}")
+        return channel
+    
+    def _get_config(
+        self,
+        template: Template,
+        configs: Dict[TemplateType, Any]
+    ) -> Union[SMTPConfig, WhatsAppConfig]:
+        """
+        Get the configuration for a template's channel
+        
+        Args:
+            template: Template entity with a supported type
+            configs: Result of _get_configs
+            
+        Returns:
+            Validated configuration
+            
+        Raises:
+            ConfigurationNotFoundError: If configuration not found
+            ValueError: If the stored configuration is invalid
+        """
+        config = configs[template.type]
+        if isinstance(config, Exception):
+            raise config
+        if config is None:
+            raise ConfigurationNotFoundError(f"{self._channels[template.type].name} configuration not found")
+        return config
+    
+    def _enqueue_log(self, message_log: MessageLog) -> bool:
+        """Hand a message log to the background writer, if one is running"""
+        return self.message_log_writer is not None and self.message_log_writer.enqueue(message_log)
+    
+    @staticmethod
+    def _build_log(
+        template: Template,
+        recipient_email: Optional[str],
+        recipient_phone: Optional[str],
+        variables: Dict[str, Any],
+        result: Dict[str, Any]
+    ) -> MessageLog:
+        """Build the message log for a send result"""
+        now = datetime.now(timezone.utc)
+        return MessageLog(
+            id=str(uuid4()),
+            template_id=template.id,
+            template_name=template.name,
+            recipient_email=recipient_email,
+            recipient_phone=recipient_phone,
+            type=template.type.value,
+            subject=template.subject,
+            content=template.content,
+            variables_used=variables,
+            status=result.get("status", MessageStatus.FAILED),
+            error_message=result.get("error"),
+            sent_at=now if result.get("success") else None,
+            created_at=now
+        )
@@ -3,7 +3,7 @@ Configuration management for JCI Connect Backend
 """
 from typing import Optional, Union
 from pydantic_settings import BaseSettings
-from pydantic import Field, field_validator
+from pydantic import AliasChoices, Field, field_validator
 
 
 class Settings(BaseSettings):
@@ -19,13 +19,16 @@ class Settings(BaseSettings):
     port: int = 8000
     
     # CORS Configuration
-    cors_origins_list: list[str] = Field(
+    # Read from CORS_ORIGINS as a comma-separated list; the str member lets a
+    # non-JSON value reach the validator below instead of failing to decode
+    cors_origins_list: Union[list[str], str] = Field(
         default=[
             "http://localhost:3000",
             "http://localhost:5173",
             "http://127.0.0.1:3000",
             "http://127.0.0.1:5173",
-        ]
+        ],
+        validation_alias=AliasChoices("cors_origins", "cors_origins_list")
     )
     
     # Supabase Configuration
@@ -33,6 +36,23 @@ class Settings(BaseSettings):
     supabase_anon_key: Optional[str] = Field(None, env="SUPABASE_ANON_KEY")
     supabase_secret_key: str = Field(..., env="SUPABASE_SECRET_KEY")
     
+    # Direct Postgres access (optional)
+    # Prefer the session-mode pooler (port 5432): asyncpg caches prepared
+    # statements per connection, which transaction-mode pooling (port 6543)
+    # breaks unless DATABASE_STATEMENT_CACHE_SIZE is set to 0. Keep the pool
+    # small per worker; the pooler's client limit is shared by all workers.
+    database_url: Optional[str] = Field(None, env="DATABASE_URL")
+    database_pool_min_size: int = 5
+    database_pool_max_size: int = 20
+    database_statement_cache_size: int = 100
+    # Seconds an idle pooled connection is kept before it is closed
+    database_pool_max_inactive_lifetime: float = 300.0
+    # Seconds a single query may run before it is cancelled
+    database_command_timeout: float = 30.0
+    
+    # Directory for persisted Jinja template bytecode (optional)
+    jinja_cache_dir: Optional[str] = Field(None, env="JINJA_CACHE_DIR")
+    
     # Note: SMTP and WhatsApp configurations are now stored in organization_settings table
     
     # Security
@@ -40,13 +60,15 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     
-    def __init__(self, **kwargs):
-        # Handle CORS_ORIGINS from environment manually
-        import os
-        cors_origins_env = os.getenv('CORS_ORIGINS')
-        if cors_origins_env:
-            kwargs['cors_origins_list'] = [origin.strip() for origin in cors_origins_env.split(',')]
-        super().__init__(**kwargs)
+    @field_validator("cors_origins_list", mode="before")
+    @classmethod
+    def split_cors_origins(cls, value):
+        """Split a comma-separated CORS_ORIGINS value into a list"""
+        if isinstance(value, str):
+            if not value.strip():
+                return cls.model_fields["cors_origins_list"].default
+            return [origin.strip() for origin in value.split(",")]
+        return value
     
     @property
     def cors_origins(self):
@@ -2,7 +2,7 @@
 Domain entities for the communication domain
 """
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 from app.domain.value_objects import MessageStatus, MessageType, TemplateType
@@ -10,6 +10,8 @@ from app.domain.value_objects import MessageStatus, MessageType, TemplateType
 
 class Template(BaseModel):
     """Template entity"""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     name: str
     type: TemplateType
@@ -24,8 +26,11 @@ class Template(BaseModel):
 
 class MessageLog(BaseModel):
     """Message log entity"""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     template_id: Optional[str] = None
+    template_name: Optional[str] = None
     recipient_id: Optional[str] = None
     recipient_email: Optional[str] = None
     recipient_phone: Optional[str] = None
@@ -42,6 +47,8 @@ class MessageLog(BaseModel):
 
 class OrganizationSettings(BaseModel):
     """Organization settings entity"""
+    model_config = ConfigDict(frozen=True)
+    
     id: Optional[str] = None
     email_config: Optional[Dict[str, Any]] = None
     whatsapp_config: Optional[Dict[str, Any]] = None
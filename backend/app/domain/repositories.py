@@ -1,10 +1,11 @@
 """
 Repository interfaces for the communication domain
 """
-from typing import Protocol, Optional, Dict, Any
+from typing import Protocol, Optional, Dict, Any, AsyncIterator
 from abc import ABC, abstractmethod
 
 from app.domain.entities import Template, MessageLog, OrganizationSettings
+from app.domain.value_objects import SMTPConfig, WhatsAppConfig
 
 
 class TemplateRepository(Protocol):
@@ -38,6 +39,10 @@ class MessageLogRepository(Protocol):
         """Create a new message log"""
         ...
     
+    async def create_many(self, message_logs: list[MessageLog]) -> list[MessageLog]:
+        """Create several message logs in one write"""
+        ...
+    
     async def get_by_id(self, log_id: str) -> Optional[MessageLog]:
         """Get message log by ID"""
         ...
@@ -45,6 +50,10 @@ class MessageLogRepository(Protocol):
     async def get_by_template_id(self, template_id: str) -> list[MessageLog]:
         """Get message logs by template ID"""
         ...
+    
+    def aiter_by_template_id(self, template_id: str, chunk_size: int = 500) -> AsyncIterator[MessageLog]:
+        """Iterate over message logs by template ID, fetching chunk_size rows at a time"""
+        ...
 
 
 class OrganizationSettingsRepository(Protocol):
@@ -65,4 +74,12 @@ class OrganizationSettingsRepository(Protocol):
     async def get_whatsapp_config(self) -> Optional[Dict[str, Any]]:
         """Get WhatsApp configuration"""
         ...
+    
+    async def get_smtp_config(self) -> Optional[SMTPConfig]:
+        """Get the validated SMTP configuration, or None if not configured"""
+        ...
+    
+    async def get_whatsapp_api_config(self) -> Optional[WhatsAppConfig]:
+        """Get the validated WhatsApp configuration, or None if not configured"""
+        ...
 
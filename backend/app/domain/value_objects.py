@@ -1,12 +1,18 @@
 """
 Value objects for the communication domain
 """
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, EmailStr, Field
+from typing import Annotated, Optional, Dict, Any, List
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
 from datetime import datetime
 from enum import Enum
 
 
+# Syntactic email check run inside pydantic-core; cheaper per request than
+# EmailStr, which calls into email-validator
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+EmailAddress = Annotated[str, StringConstraints(pattern=EMAIL_PATTERN, max_length=254)]
+
+
 class MessageStatus(str, Enum):
     """Message status enumeration"""
     PENDING = "pending"
@@ -29,6 +35,8 @@ class TemplateType(str, Enum):
 
 class SMTPConfig(BaseModel):
     """SMTP configuration value object"""
+    model_config = ConfigDict(frozen=True)
+    
     host: str
     port: int = 587
     username: str
@@ -40,6 +48,8 @@ class SMTPConfig(BaseModel):
 
 class WhatsAppConfig(BaseModel):
     """WhatsApp Evolution API configuration value object"""
+    model_config = ConfigDict(frozen=True)
+    
     api_url: str
     api_key: str
     instance_name: str
@@ -1,28 +1,141 @@
 """
 Email adapter for sending emails via SMTP
 """
+import asyncio
+import time
 import aiosmtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
 from email.utils import formataddr
-from typing import Optional, Dict, Any
+from email import policy
+from typing import Optional, Dict, Any, List, Tuple, Union
 import logging
 from jinja2 import Template
 
 from app.domain.value_objects import SMTPConfig, MessageStatus
 from app.application.ports.message_sender import MessageSender
+from app.infrastructure.templating import render
 
 logger = logging.getLogger(__name__)
 
+# Seconds an open SMTP session may sit unused before it is reconnected
+SMTP_IDLE_TIMEOUT = 60.0
+
 
 class EmailAdapter(MessageSender):
     """Email adapter for sending emails via SMTP"""
     
+    __slots__ = ("_smtp", "_session_key", "_last_used", "_lock")
+    
+    def __init__(self):
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._session_key: Optional[Tuple[Any, ...]] = None
+        self._last_used = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def _get_session(self, config: SMTPConfig) -> aiosmtplib.SMTP:
+        """
+        Get a connected, authenticated SMTP session for the configuration
+        
+        The session is kept open and reused by later sends; it is replaced
+        when the configuration changes, the server dropped it, or it has
+        been idle longer than SMTP_IDLE_TIMEOUT. Callers must hold the lock.
+        
+        Args:
+            config: SMTP configuration
+            
+        Returns:
+            Connected SMTP client
+        """
+        key = (config.host, config.port, config.username, config.password, config.use_tls)
+        if self._smtp is not None and (
+            self._session_key != key
+            or not self._smtp.is_connected
+            or time.monotonic() - self._last_used > SMTP_IDLE_TIMEOUT
+        ):
+            await self._close_session()
+        
+        if self._smtp is None:
+            smtp = aiosmtplib.SMTP(
+                hostname=config.host,
+                port=config.port,
+                use_tls=config.use_tls,
+                start_tls=config.use_tls
+            )
+            await smtp.connect()
+            await smtp.login(config.username, config.password)
+            self._smtp = smtp
+            self._session_key = key
+        
+        return self._smtp
+    
+    async def _close_session(self) -> None:
+        """Close the open SMTP session, if any"""
+        smtp, self._smtp, self._session_key = self._smtp, None, None
+        if smtp is not None and smtp.is_connected:
+            try:
+                await smtp.quit()
+            except aiosmtplib.SMTPException:
+                smtp.close()
+    
+    async def close(self) -> None:
+        """Close the shared SMTP session"""
+        async with self._lock:
+            await self._close_session()
+    
+    def _prepare_message(self, content: str, subject: Optional[str], config: SMTPConfig) -> bytes:
+        """
+        Build and serialize a message once, without its To header
+        
+        Args:
+            content: Rendered HTML content
+            subject: Rendered subject
+            config: SMTP configuration
+            
+        Returns:
+            Serialized message with CRLF line endings
+        """
+        message = EmailMessage(policy=policy.SMTP)
+        message["Subject"] = subject or "Message from JCI Connect"
+        message["From"] = formataddr((config.from_name, config.from_email))
+        
+        # Single HTML body (assume HTML by default), kept 7-bit clean so
+        # servers without 8BITMIME accept it
+        message.set_content(content, subtype="html", charset="utf-8", cte="quoted-printable")
+        
+        return message.as_bytes()
+    
+    async def _deliver(self, config: SMTPConfig, recipient: str, message_data: bytes) -> None:
+        """
+        Send a prepared message to one recipient over the shared session
+        
+        Args:
+            config: SMTP configuration
+            recipient: Recipient email address
+            message_data: Message from _prepare_message
+        """
+        if "\r" in recipient or "\n" in recipient:
+            raise ValueError(f"Invalid recipient: {recipient!r}")
+        message_data = b"To: " + recipient.encode() + b"\r\n" + message_data
+        
+        # Reconnect once if the server closed the session since the last send
+        async with self._lock:
+            try:
+                smtp = await self._get_session(config)
+                await smtp.sendmail(config.from_email, [recipient], message_data)
+            except aiosmtplib.SMTPServerDisconnected:
+                await self._close_session()
+                smtp = await self._get_session(config)
+                await smtp.sendmail(config.from_email, [recipient], message_data)
+            except Exception:
+                await self._close_session()
+                raise
+            self._last_used = time.monotonic()
+    
     async def send(
         self,
         recipient: str,
-        content: str,
-        subject: Optional[str],
+        content: Union[str, Template],
+        subject: Optional[Union[str, Template]],
         variables: Dict[str, Any],
         config: SMTPConfig
     ) -> Dict[str, Any]:
@@ -31,8 +144,8 @@ class EmailAdapter(MessageSender):
         
         Args:
             recipient: Recipient email address
-            content: Email content (with Jinja2 variables)
-            subject: Email subject
+            content: Email content (with Jinja2 variables), as source or precompiled
+            subject: Email subject, as source or precompiled
             variables: Variables to replace in content
             config: SMTP configuration
             
@@ -50,31 +163,14 @@ class EmailAdapter(MessageSender):
             
             # Render template if variables provided
             if variables:
-                content = self.render_template(content, variables)
-                subject = self.render_template(subject, variables) if subject else None
+                content = render(content, variables)
+                subject = render(subject, variables) if subject else None
             
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject or "Message from JCI Connect"
-            message["From"] = formataddr((config.from_name, config.from_email))
-            message["To"] = recipient
+            # Create and send message
+            message_data = self._prepare_message(content, subject, config)
+            await self._deliver(config, recipient, message_data)
             
-            # Add content (assume HTML by default)
-            html_part = MIMEText(content, "html", "utf-8")
-            message.attach(html_part)
-            
-            # Send email
-            await aiosmtplib.send(
-                message,
-                hostname=config.host,
-                port=config.port,
-                username=config.username,
-                password=config.password,
-                use_tls=config.use_tls,
-                start_tls=config.use_tls
-            )
-            
-            logger.info(f"Email sent successfully to {recipient}")
+            logger.info("Email sent successfully to %s", recipient)
             return {
                 "success": True,
                 "message": "Email sent successfully",
@@ -84,37 +180,110 @@ class EmailAdapter(MessageSender):
             }
             
         except Exception as e:
-            logger.error(f"Failed to send email to {recipient}: {str(e)}")
+            logger.error("Failed to send email to %s: %s", recipient, e)
             return {
                 "success": False,
                 "error": str(e),
                 "status": MessageStatus.FAILED.value,
                 "recipient": recipient,
-                "subject": subject
+                "subject": subject if isinstance(subject, str) else None
             }
     
-    def render_template(self, template_content: str, variables: Dict[str, Any]) -> str:
-        """Render template with variables"""
+    async def send_many(
+        self,
+        recipients: List[str],
+        content: Union[str, Template],
+        subject: Optional[Union[str, Template]],
+        variables: Dict[str, Any],
+        config: SMTPConfig
+    ) -> List[Dict[str, Any]]:
+        """
+        Send the same email to several recipients via SMTP
+        
+        The content is rendered and the MIME message encoded once; only the
+        To header differs per recipient.
+        
+        Args:
+            recipients: Recipient email addresses
+            content: Email content (with Jinja2 variables), as source or precompiled
+            subject: Email subject, as source or precompiled
+            variables: Variables to replace in content, shared by all recipients
+            config: SMTP configuration
+            
+        Returns:
+            One result dict per recipient, in order
+        """
         try:
-            template = Template(template_content)
-            return template.render(**variables)
+            # Validate configuration
+            if not config.host or not config.username:
+                return [{
+                    "success": False,
+                    "error": "SMTP configuration incomplete",
+                    "status": MessageStatus.FAILED.value,
+                    "recipient": recipient
+                } for recipient in recipients]
+            
+            # Render template if variables provided
+            if variables:
+                content = render(content, variables)
+                subject = render(subject, variables) if subject else None
+            
+            message_data = self._prepare_message(content, subject, config)
         except Exception as e:
-            logger.error(f"Failed to render template: {str(e)}")
-            raise ValueError(f"Template rendering failed: {str(e)}")
+            logger.error("Failed to prepare email: %s", e)
+            return [{
+                "success": False,
+                "error": str(e),
+                "status": MessageStatus.FAILED.value,
+                "recipient": recipient,
+                "subject": subject if isinstance(subject, str) else None
+            } for recipient in recipients]
+        
+        results = []
+        for recipient in recipients:
+            try:
+                await self._deliver(config, recipient, message_data)
+                logger.info("Email sent successfully to %s", recipient)
+                results.append({
+                    "success": True,
+                    "message": "Email sent successfully",
+                    "status": MessageStatus.SENT.value,
+                    "recipient": recipient,
+                    "subject": subject
+                })
+            except Exception as e:
+                logger.error("Failed to send email to %s: %s", recipient, e)
+                results.append({
+                    "success": False,
+                    "error": str(e),
+                    "status": MessageStatus.FAILED.value,
+                    "recipient": recipient,
+                    "subject": subject
+                })
+        return results
     
     async def test_connection(self, config: SMTPConfig) -> Dict[str, Any]:
-        """Test SMTP connection"""
-        try:
-            smtp = aiosmtplib.SMTP(
-                hostname=config.host,
-                port=config.port,
-                use_tls=config.use_tls,
-                start_tls=config.use_tls
-            )
+        """
+        Test SMTP connection
+        
+        Opens (or checks) the shared session rather than a throwaway
+        connection, so a send that follows the test reuses it.
+        
+        Args:
+            config: SMTP configuration
             
-            await smtp.connect()
-            await smtp.login(config.username, config.password)
-            await smtp.quit()
+        Returns:
+            Dict with success status and details
+        """
+        try:
+            async with self._lock:
+                try:
+                    smtp = await self._get_session(config)
+                    await smtp.noop()
+                except Exception:
+                    await self._close_session()
+                    raise
+                self._last_used = time.monotonic()
             
             return {
                 "success": True,
@@ -124,7 +293,7 @@ class EmailAdapter(MessageSender):
             }
             
         except Exception as e:
-            logger.error(f"SMTP connection test failed: {str(e)}")
+            logger.error("SMTP connection test failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
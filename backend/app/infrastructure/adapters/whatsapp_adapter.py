@@ -1,20 +1,53 @@
 """
 WhatsApp adapter for sending messages via Evolution API
 """
+import asyncio
 import httpx
 import logging
-from typing import Optional, Dict, Any
+import orjson
+from typing import Optional, Dict, Any, List, Union
 from jinja2 import Template
 
 from app.domain.value_objects import WhatsAppConfig, MessageStatus
 from app.application.ports.message_sender import MessageSender
+from app.infrastructure.templating import render
+from app.utils.evolution_api import format_phone_number, get_message_id, get_instance_state
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent Evolution API requests within one send_many call
+SEND_MANY_CONCURRENCY = 10
+
 
 class WhatsAppAdapter(MessageSender):
     """WhatsApp adapter for sending messages via Evolution API"""
     
+    __slots__ = ("_client",)
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the adapter
+        
+        Args:
+            client: HTTP client to use; one is created on first use if omitted
+        """
+        self._client = client
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, keeping connections to Evolution API alive between calls"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=30.0
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     def _get_headers(self, api_key: str) -> Dict[str, str]:
         """Get headers for Evolution API requests"""
         return {
@@ -24,30 +57,12 @@ class WhatsAppAdapter(MessageSender):
     
     def _format_phone_number(self, phone: str) -> str:
         """Format phone number for WhatsApp"""
-        digits_only = ''.join(filter(str.isdigit, phone))
-        
-        if len(digits_only) == 10:
-            digits_only = "1" + digits_only
-        elif len(digits_only) == 11 and digits_only.startswith("1"):
-            pass
-        elif len(digits_only) < 10:
-            raise ValueError(f"Invalid phone number format: {phone}")
-        
-        return digits_only
-    
-    def render_template(self, template_content: str, variables: Dict[str, Any]) -> str:
-        """Render template with variables"""
-        try:
-            template = Template(template_content)
-            return template.render(**variables)
-        except Exception as e:
-            logger.error(f"Failed to render WhatsApp template: {str(e)}")
-            raise ValueError(f"Template rendering failed: {str(e)}")
+        return format_phone_number(phone)
     
     async def send(
         self,
         recipient: str,
-        content: str,
+        content: Union[str, Template],
         subject: Optional[str],
         variables: Dict[str, Any],
         config: WhatsAppConfig
@@ -57,7 +72,7 @@ class WhatsAppAdapter(MessageSender):
         
         Args:
             recipient: Recipient phone number
-            content: Message content (with Jinja2 variables)
+            content: Message content (with Jinja2 variables), as source or precompiled
             subject: Not used for WhatsApp
             variables: Variables to replace in content
             config: WhatsApp configuration
@@ -79,7 +94,7 @@ class WhatsAppAdapter(MessageSender):
             
             # Render template if variables provided
             if variables:
-                content = self.render_template(content, variables)
+                content = render(content, variables)
             
             # Prepare message payload
             payload = {
@@ -90,37 +105,36 @@ class WhatsAppAdapter(MessageSender):
             # Send message via Evolution API
             url = f"{config.api_url}/message/sendText/{config.instance_name}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    json=payload,
-                    headers=self._get_headers(config.api_key),
-                    timeout=30.0
-                )
+            response = await self._get_client().post(
+                url,
+                content=orjson.dumps(payload),
+                headers=self._get_headers(config.api_key),
+                timeout=30.0
+            )
+            
+            if response.status_code == 200:
+                response_data = orjson.loads(response.content)
+                logger.info("WhatsApp message sent successfully to %s", formatted_phone)
+                return {
+                    "success": True,
+                    "message": "WhatsApp message sent successfully",
+                    "status": MessageStatus.SENT.value,
+                    "recipient": formatted_phone,
+                    "message_id": get_message_id(response_data),
+                    "response": response_data
+                }
+            else:
+                error_msg = f"Evolution API error: {response.status_code} - {response.text}"
+                logger.error("WhatsApp send failed: %s", error_msg)
+                return {
+                    "success": False,
+                    "error": error_msg,
+                    "status": MessageStatus.FAILED.value,
+                    "recipient": formatted_phone
+                }
                 
-                if response.status_code == 200:
-                    response_data = response.json()
-                    logger.info(f"WhatsApp message sent successfully to {formatted_phone}")
-                    return {
-                        "success": True,
-                        "message": "WhatsApp message sent successfully",
-                        "status": MessageStatus.SENT.value,
-                        "recipient": formatted_phone,
-                        "message_id": response_data.get("key", {}).get("id"),
-                        "response": response_data
-                    }
-                else:
-                    error_msg = f"Evolution API error: {response.status_code} - {response.text}"
-                    logger.error(f"WhatsApp send failed: {error_msg}")
-                    return {
-                        "success": False,
-                        "error": error_msg,
-                        "status": MessageStatus.FAILED.value,
-                        "recipient": formatted_phone
-                    }
-                    
         except Exception as e:
-            logger.error(f"Failed to send WhatsApp message to {recipient}: {str(e)}")
+            logger.error("Failed to send WhatsApp message to %s: %s", recipient, e)
             return {
                 "success": False,
                 "error": str(e),
@@ -128,6 +142,48 @@ class WhatsAppAdapter(MessageSender):
                 "recipient": recipient
             }
     
+    async def send_many(
+        self,
+        recipients: List[str],
+        content: Union[str, Template],
+        subject: Optional[str],
+        variables: Dict[str, Any],
+        config: WhatsAppConfig
+    ) -> List[Dict[str, Any]]:
+        """
+        Send the same WhatsApp message to several recipients
+        
+        The content is rendered once and the sends run concurrently.
+        
+        Args:
+            recipients: Recipient phone numbers
+            content: Message content (with Jinja2 variables), as source or precompiled
+            subject: Not used for WhatsApp
+            variables: Variables to replace in content, shared by all recipients
+            config: WhatsApp configuration
+            
+        Returns:
+            One result dict per recipient, in order
+        """
+        try:
+            if variables:
+                content = render(content, variables)
+        except Exception as e:
+            return [{
+                "success": False,
+                "error": str(e),
+                "status": MessageStatus.FAILED.value,
+                "recipient": recipient
+            } for recipient in recipients]
+        
+        semaphore = asyncio.Semaphore(SEND_MANY_CONCURRENCY)
+        
+        async def send_one(recipient: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.send(recipient, content, None, {}, config)
+        
+        return list(await asyncio.gather(*(send_one(recipient) for recipient in recipients)))
+    
     async def get_instance_status(self, config: WhatsAppConfig) -> Dict[str, Any]:
         """Get Evolution API instance status"""
         try:
@@ -139,31 +195,31 @@ class WhatsAppAdapter(MessageSender):
             
             url = f"{config.api_url}/instance/connectionState/{config.instance_name}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers=self._get_headers(config.api_key),
-                    timeout=10.0
-                )
+            response = await self._get_client().get(
+                url,
+                headers=self._get_headers(config.api_key),
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                state = get_instance_state(data)
+                return {
+                    "success": True,
+                    "instance_name": config.instance_name,
+                    "status": state,
+                    "connected": state == "open",
+                    "response": data
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": f"Failed to get instance status: {response.status_code}",
+                    "instance_name": config.instance_name
+                }
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "success": True,
-                        "instance_name": config.instance_name,
-                        "status": data.get("instance", {}).get("state"),
-                        "connected": data.get("instance", {}).get("state") == "open",
-                        "response": data
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": f"Failed to get instance status: {response.status_code}",
-                        "instance_name": config.instance_name
-                    }
-                    
         except Exception as e:
-            logger.error(f"Failed to get WhatsApp instance status: {str(e)}")
+            logger.error("Failed to get WhatsApp instance status: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -181,30 +237,29 @@ class WhatsAppAdapter(MessageSender):
             
             url = f"{config.api_url}/instance/connect/{config.instance_name}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers=self._get_headers(config.api_key),
-                    timeout=10.0
-                )
+            response = await self._get_client().get(
+                url,
+                headers=self._get_headers(config.api_key),
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                return {
+                    "success": True,
+                    "qr_code": data.get("base64"),
+                    "instance_name": config.instance_name,
+                    "response": data
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": f"Failed to get QR code: {response.status_code}",
+                    "instance_name": config.instance_name
+                }
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "success": True,
-                        "qr_code": data.get("base64"),
-                        "instance_name": config.instance_name,
-                        "response": data
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": f"Failed to get QR code: {response.status_code}",
-                        "instance_name": config.instance_name
-                    }
-                    
         except Exception as e:
-            logger.error(f"Failed to get WhatsApp QR code: {str(e)}")
+            logger.error("Failed to get WhatsApp QR code: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -232,7 +287,7 @@ class WhatsAppAdapter(MessageSender):
                 }
                 
         except Exception as e:
-            logger.error(f"WhatsApp connection test failed: {str(e)}")
+            logger.error("WhatsApp connection test failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -0,0 +1,107 @@
+"""
+Caching decorator for the organization settings repository
+"""
+import asyncio
+from typing import Optional, Dict, Any, Callable, TypeVar
+
+from app.domain.entities import OrganizationSettings
+from app.domain.value_objects import SMTPConfig, WhatsAppConfig
+from app.application.ports.organization_settings_repository import OrganizationSettingsRepository
+from app.utils.cache import TTLCache
+
+_ConfigT = TypeVar("_ConfigT", SMTPConfig, WhatsAppConfig)
+
+
+class CachedOrganizationSettingsRepository:
+    """Organization settings repository that memoizes reads for a short TTL"""
+    
+    __slots__ = ("_delegate", "_cache", "_lock")
+    
+    def __init__(self, delegate: OrganizationSettingsRepository, ttl: float = 60.0):
+        """
+        Initialize the repository
+        
+        Args:
+            delegate: Repository that performs the actual reads and writes
+            ttl: Seconds a cached read stays valid
+        """
+        self._delegate = delegate
+        self._cache = TTLCache(ttl, maxsize=3)
+        self._lock = asyncio.Lock()
+    
+    async def get_settings(self) -> Optional[OrganizationSettings]:
+        """Get organization settings, sharing one fetch between concurrent callers"""
+        settings = self._cache.get("settings")
+        if settings is not None:
+            return settings
+        
+        async with self._lock:
+            # Another caller may have filled the cache while we waited
+            settings = self._cache.get("settings")
+            if settings is None:
+                settings = await self._delegate.get_settings()
+                if settings is not None:
+                    self._cache.set("settings", settings)
+        return settings
+    
+    async def update_settings(self, settings: OrganizationSettings) -> OrganizationSettings:
+        """Update organization settings and drop cached reads"""
+        try:
+            return await self._delegate.update_settings(settings)
+        finally:
+            self._cache.clear()
+    
+    async def get_email_config(self) -> Optional[Dict[str, Any]]:
+        """Get email configuration"""
+        settings = await self.get_settings()
+        return settings.email_config if settings else None
+    
+    async def get_whatsapp_config(self) -> Optional[Dict[str, Any]]:
+        """Get WhatsApp configuration"""
+        settings = await self.get_settings()
+        return settings.whatsapp_config if settings else None
+    
+    async def get_smtp_config(self) -> Optional[SMTPConfig]:
+        """Get the validated SMTP configuration, or None if not configured"""
+        return await self._get_config_object("smtp_config", "email_config", SMTPConfig)
+    
+    async def get_whatsapp_api_config(self) -> Optional[WhatsAppConfig]:
+        """Get the validated WhatsApp configuration, or None if not configured"""
+        return await self._get_config_object("whatsapp_api_config", "whatsapp_config", WhatsAppConfig)
+    
+    async def _get_config_object(
+        self,
+        key: str,
+        field: str,
+        build: Callable[..., _ConfigT]
+    ) -> Optional[_ConfigT]:
+        """
+        Get a config value object built from the cached settings
+        
+        The object is validated once per settings row and reused until the
+        settings are refetched.
+        
+        Args:
+            key: Cache key for the built object
+            field: Settings field holding the raw config
+            build: Value object class to validate the config with
+        
+        Returns:
+            Validated config, or None if the field is empty
+        """
+        settings = await self.get_settings()
+        config_data = getattr(settings, field) if settings else None
+        if not config_data:
+            return None
+        
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] is settings:
+            return cached[1]
+        
+        config = build(**config_data)
+        self._cache.set(key, (settings, config))
+        return config
+    
+    def invalidate(self) -> None:
+        """Drop all cached reads"""
+        self._cache.clear()
@@ -0,0 +1,76 @@
+"""
+Caching decorator for the template repository
+"""
+import asyncio
+from typing import Optional, Dict
+
+from app.domain.entities import Template
+from app.application.ports.template_repository import TemplateRepository
+from app.utils.cache import TTLCache
+
+
+class CachedTemplateRepository:
+    """Template repository that memoizes lookups by ID for a short TTL"""
+    
+    __slots__ = ("_delegate", "_cache", "_inflight")
+    
+    def __init__(self, delegate: TemplateRepository, ttl: float = 60.0, maxsize: int = 256):
+        """
+        Initialize the repository
+        
+        Args:
+            delegate: Repository that performs the actual reads and writes
+            ttl: Seconds a cached template stays valid
+            maxsize: Maximum number of cached templates
+        """
+        self._delegate = delegate
+        self._cache = TTLCache(ttl, maxsize=maxsize)
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    async def get_by_id(self, template_id: str) -> Optional[Template]:
+        """Get template by ID, sharing one fetch between concurrent callers"""
+        template = self._cache.get(template_id)
+        if template is not None:
+            return template
+        
+        fetch = self._inflight.get(template_id)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch(template_id))
+            self._inflight[template_id] = fetch
+            fetch.add_done_callback(lambda _: self._inflight.pop(template_id, None))
+        
+        # Shield so one cancelled request does not cancel the fetch for the others
+        return await asyncio.shield(fetch)
+    
+    async def _fetch(self, template_id: str) -> Optional[Template]:
+        """Load a template from the delegate and cache it if found"""
+        template = await self._delegate.get_by_id(template_id)
+        if template is not None:
+            self._cache.set(template_id, template)
+        return template
+    
+    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Template]:
+        """Get all templates"""
+        return await self._delegate.get_all(skip, limit)
+    
+    async def create(self, template: Template) -> Template:
+        """Create a new template"""
+        return await self._delegate.create(template)
+    
+    async def update(self, template_id: str, template: Template) -> Template:
+        """Update a template and drop its cached copy"""
+        try:
+            return await self._delegate.update(template_id, template)
+        finally:
+            self._cache.pop(template_id)
+    
+    async def delete(self, template_id: str) -> bool:
+        """Delete a template and drop its cached copy"""
+        try:
+            return await self._delegate.delete(template_id)
+        finally:
+            self._cache.pop(template_id)
+    
+    def invalidate(self) -> None:
+        """Drop all cached templates"""
+        self._cache.clear()
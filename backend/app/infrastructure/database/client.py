@@ -2,37 +2,33 @@
 Supabase client for the infrastructure layer
 """
 import logging
+from functools import cache
 from supabase import create_client, Client
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Global Supabase client
-_supabase_client: Client = None
-
 
+@cache
 def get_supabase_client() -> Client:
     """
     Get Supabase client instance
     
+    The client is created on first call and reused afterwards.
+    
     Returns:
         Supabase client
     """
-    global _supabase_client
-    
-    if _supabase_client is None:
-        try:
-            logger.info(f"Creating Supabase client with URL: {settings.supabase_url}")
-            
-            # Use the secret key for backend operations
-            _supabase_client = create_client(
-                settings.supabase_url,
-                settings.supabase_secret_key
-            )
-            logger.info("Supabase client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Supabase client: {str(e)}")
-            raise
-    
-    return _supabase_client
-
+    try:
+        logger.info("Creating Supabase client with URL: %s", settings.supabase_url)
+        
+        # Use the secret key for backend operations
+        client = create_client(
+            settings.supabase_url,
+            settings.supabase_secret_key
+        )
+        logger.info("Supabase client initialized successfully")
+        return client
+    except Exception as e:
+        logger.error("Failed to initialize Supabase client: %s", e)
+        raise
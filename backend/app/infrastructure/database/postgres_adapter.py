@@ -0,0 +1,264 @@
+"""
+Postgres adapter for database access over the asyncpg pool
+"""
+import logging
+from typing import Optional, Dict, Any, AsyncIterator
+
+import asyncpg
+
+from app.domain.entities import Template, MessageLog, OrganizationSettings
+from app.domain.exceptions import TemplateNotFoundError, ConfigurationNotFoundError
+from app.utils.database import get_postgres_pool
+
+logger = logging.getLogger(__name__)
+
+# uuid columns are cast to text so rows validate against the str id fields
+_TEMPLATE_COLUMNS = (
+    "id::text AS id, name, type, subject, content, variables, is_active, "
+    "created_by::text AS created_by, created_at, updated_at"
+)
+_MESSAGE_LOG_COLUMNS = (
+    "id::text AS id, template_id::text AS template_id, template_name, recipient_id::text AS recipient_id, "
+    "recipient_email, recipient_phone, type, subject, content, variables_used, status, "
+    "error_message, sent_at, delivered_at, created_at"
+)
+_ORGANIZATION_SETTINGS_COLUMNS = "id::text AS id, email_config, whatsapp_config, created_at, updated_at"
+
+# Columns written when inserting a message log
+_MESSAGE_LOG_INSERT_COLUMNS = (
+    "id", "template_id", "template_name", "recipient_id", "recipient_email", "recipient_phone", "type",
+    "subject", "content", "variables_used", "status", "error_message", "sent_at", "delivered_at", "created_at"
+)
+_TEMPLATE_WRITE_COLUMNS = ("name", "type", "subject", "content", "variables", "is_active", "created_by")
+
+
+def _pool() -> asyncpg.Pool:
+    """Get the shared pool, which main.py creates at startup"""
+    pool = get_postgres_pool()
+    if pool is None:
+        raise RuntimeError("Postgres connection pool is not initialized")
+    return pool
+
+
+def _message_log_values(message_log: MessageLog) -> list[Any]:
+    """Get a message log's values in _MESSAGE_LOG_INSERT_COLUMNS order"""
+    data = message_log.model_dump(include=set(_MESSAGE_LOG_INSERT_COLUMNS))
+    data["type"] = message_log.type.value
+    data["status"] = message_log.status.value
+    return [data[column] for column in _MESSAGE_LOG_INSERT_COLUMNS]
+
+
+class PostgresTemplateRepository:
+    """Template repository implementation using asyncpg"""
+    
+    __slots__ = ()
+    
+    async def get_by_id(self, template_id: str) -> Optional[Template]:
+        """Get template by ID"""
+        try:
+            row = await _pool().fetchrow(
+                f"SELECT {_TEMPLATE_COLUMNS} FROM public.message_templates WHERE id = $1",
+                template_id
+            )
+            return Template.model_validate(dict(row)) if row else None
+        except Exception as e:
+            logger.error(f"Error fetching template: {str(e)}")
+            return None
+    
+    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Template]:
+        """Get all templates"""
+        try:
+            rows = await _pool().fetch(
+                f"SELECT {_TEMPLATE_COLUMNS} FROM public.message_templates ORDER BY created_at DESC OFFSET $1 LIMIT $2",
+                skip,
+                limit
+            )
+            return [Template.model_validate(dict(row)) for row in rows]
+        except Exception as e:
+            logger.error(f"Error fetching templates: {str(e)}")
+            return []
+    
+    async def create(self, template: Template) -> Template:
+        """Create a new template"""
+        try:
+            data = template.model_dump(include=set(_TEMPLATE_WRITE_COLUMNS), mode="json")
+            placeholders = ", ".join(f"${i}" for i in range(1, len(_TEMPLATE_WRITE_COLUMNS) + 1))
+            row = await _pool().fetchrow(
+                f"INSERT INTO public.message_templates ({', '.join(_TEMPLATE_WRITE_COLUMNS)}) "
+                f"VALUES ({placeholders}) RETURNING id::text AS id, created_at, updated_at",
+                *(data[column] for column in _TEMPLATE_WRITE_COLUMNS)
+            )
+            return template.model_copy(update=dict(row))
+        except Exception as e:
+            logger.error(f"Error creating template: {str(e)}")
+            raise
+    
+    async def update(self, template_id: str, template: Template) -> Template:
+        """Update a template"""
+        try:
+            data = template.model_dump(include=set(_TEMPLATE_WRITE_COLUMNS), mode="json")
+            assignments = ", ".join(
+                f"{column} = ${i}" for i, column in enumerate(_TEMPLATE_WRITE_COLUMNS, start=2)
+            )
+            row = await _pool().fetchrow(
+                f"UPDATE public.message_templates SET {assignments} WHERE id = $1 "
+                f"RETURNING id::text AS id, created_at, updated_at",
+                template_id,
+                *(data[column] for column in _TEMPLATE_WRITE_COLUMNS)
+            )
+            if row is None:
+                raise TemplateNotFoundError(f"Template {template_id} not found")
+            return template.model_copy(update=dict(row))
+        except Exception as e:
+            logger.error(f"Error updating template: {str(e)}")
+            raise
+    
+    async def delete(self, template_id: str) -> bool:
+        """Delete a template"""
+        try:
+            await _pool().execute("DELETE FROM public.message_templates WHERE id = $1", template_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting template: {str(e)}")
+            return False
+
+
+class PostgresMessageLogRepository:
+    """Message log repository implementation using asyncpg"""
+    
+    __slots__ = ()
+    
+    async def create(self, message_log: MessageLog) -> MessageLog:
+        """Create a new message log"""
+        logs = await self.create_many([message_log])
+        return logs[0]
+    
+    async def create_many(self, message_logs: list[MessageLog]) -> list[MessageLog]:
+        """
+        Create several message logs with a single insert
+        
+        Args:
+            message_logs: Message logs to insert into message_logs
+        
+        Returns:
+            Created message logs, in order
+        """
+        if not message_logs:
+            return []
+        try:
+            width = len(_MESSAGE_LOG_INSERT_COLUMNS)
+            args: list[Any] = []
+            values = []
+            for message_log in message_logs:
+                values.append(f"({', '.join(f'${len(args) + i}' for i in range(1, width + 1))})")
+                args.extend(_message_log_values(message_log))
+            
+            result = await _pool().fetch(
+                f"INSERT INTO public.message_logs ({', '.join(_MESSAGE_LOG_INSERT_COLUMNS)}) "
+                f"VALUES {', '.join(values)} RETURNING {_MESSAGE_LOG_COLUMNS}",
+                *args
+            )
+            return [MessageLog.model_validate(dict(row)) for row in result]
+        except Exception as e:
+            logger.error(f"Error creating message logs: {str(e)}")
+            raise
+    
+    async def get_by_id(self, log_id: str) -> Optional[MessageLog]:
+        """Get message log by ID"""
+        try:
+            row = await _pool().fetchrow(
+                f"SELECT {_MESSAGE_LOG_COLUMNS} FROM public.message_logs WHERE id = $1",
+                log_id
+            )
+            return MessageLog.model_validate(dict(row)) if row else None
+        except Exception as e:
+            logger.error(f"Error fetching message log: {str(e)}")
+            return None
+    
+    async def get_by_template_id(self, template_id: str) -> list[MessageLog]:
+        """Get message logs by template ID"""
+        try:
+            rows = await _pool().fetch(
+                f"SELECT {_MESSAGE_LOG_COLUMNS} FROM public.message_logs WHERE template_id = $1",
+                template_id
+            )
+            return [MessageLog.model_validate(dict(row)) for row in rows]
+        except Exception as e:
+            logger.error(f"Error fetching message logs: {str(e)}")
+            return []
+    
+    async def aiter_by_template_id(self, template_id: str, chunk_size: int = 500) -> AsyncIterator[MessageLog]:
+        """
+        Iterate over message logs by template ID through a server-side cursor
+        
+        Args:
+            template_id: Template ID
+            chunk_size: Rows prefetched per round trip
+        
+        Yields:
+            Message logs, oldest first
+        """
+        try:
+            async with _pool().acquire() as connection:
+                # Cursors only live inside a transaction
+                async with connection.transaction():
+                    async for row in connection.cursor(
+                        f"SELECT {_MESSAGE_LOG_COLUMNS} FROM public.message_logs "
+                        f"WHERE template_id = $1 ORDER BY created_at, id",
+                        template_id,
+                        prefetch=chunk_size
+                    ):
+                        yield MessageLog.model_validate(dict(row))
+        except Exception as e:
+            logger.error(f"Error fetching message logs: {str(e)}")
+            raise
+
+
+class PostgresOrganizationSettingsRepository:
+    """Organization settings repository implementation using asyncpg"""
+    
+    __slots__ = ()
+    
+    async def get_settings(self) -> Optional[OrganizationSettings]:
+        """Get organization settings"""
+        try:
+            row = await _pool().fetchrow(
+                f"SELECT {_ORGANIZATION_SETTINGS_COLUMNS} FROM public.organization_settings LIMIT 1"
+            )
+            return OrganizationSettings.model_validate(dict(row)) if row else None
+        except Exception as e:
+            logger.error(f"Error fetching organization settings: {str(e)}")
+            return None
+    
+    async def update_settings(self, settings: OrganizationSettings) -> OrganizationSettings:
+        """Update organization settings"""
+        try:
+            row = await _pool().fetchrow(
+                "UPDATE public.organization_settings SET email_config = $2, whatsapp_config = $3 "
+                "WHERE id = $1 RETURNING id::text AS id, created_at, updated_at",
+                settings.id,
+                settings.email_config,
+                settings.whatsapp_config
+            )
+            if row is None:
+                raise ConfigurationNotFoundError(f"Organization settings {settings.id} not found")
+            return settings.model_copy(update=dict(row))
+        except Exception as e:
+            logger.error(f"Error updating organization settings: {str(e)}")
+            raise
+    
+    async def get_email_config(self) -> Optional[Dict[str, Any]]:
+        """Get email configuration"""
+        return await self._get_config("email_config")
+    
+    async def get_whatsapp_config(self) -> Optional[Dict[str, Any]]:
+        """Get WhatsApp configuration"""
+        return await self._get_config("whatsapp_config")
+    
+    async def _get_config(self, column: str) -> Optional[Dict[str, Any]]:
+        """Read a single config column without building the settings entity"""
+        try:
+            return await _pool().fetchval(f"SELECT {column} FROM public.organization_settings LIMIT 1")
+        except Exception as e:
+            logger.error(f"Error fetching {column}: {str(e)}")
+            return None
@@ -1,67 +1,100 @@
 """
 Supabase adapter for database access
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, TypeVar, AsyncIterator
 from datetime import datetime
 
 from app.domain.entities import Template, MessageLog, OrganizationSettings
-from app.domain.value_objects import TemplateType, MessageType, MessageStatus
 from app.infrastructure.database.client import get_supabase_client
 
 logger = logging.getLogger(__name__)
 
+_EntityT = TypeVar("_EntityT", Template, OrganizationSettings)
+
+# Columns each entity is built from; selecting them explicitly keeps any
+# columns added to the tables later out of the response payloads
+_TEMPLATE_COLUMNS = "id,name,type,subject,content,variables,is_active,created_by,created_at,updated_at"
+_MESSAGE_LOG_COLUMNS = (
+    "id,template_id,template_name,recipient_id,recipient_email,recipient_phone,type,subject,content,"
+    "variables_used,status,error_message,sent_at,delivered_at,created_at"
+)
+_ORGANIZATION_SETTINGS_COLUMNS = "id,email_config,whatsapp_config,created_at,updated_at"
+
+
+# Row-to-entity hydration, bound straight to each model's pydantic-core
+# validator: it coerces the enum values and parses PostgREST timestamps in
+# native code, and skips the model_validate classmethod frame per row
+_row_to_template = Template.__pydantic_validator__.validate_python
+_row_to_message_log = MessageLog.__pydantic_validator__.validate_python
+_row_to_organization_settings = OrganizationSettings.__pydantic_validator__.validate_python
+
+
+def _with_server_fields(entity: _EntityT, data: Dict[str, Any]) -> _EntityT:
+    """
+    Copy the server-generated fields of a written row onto the entity that was sent
+    
+    Args:
+        entity: Entity whose fields were written
+        data: Row returned by the insert or update
+    
+    Returns:
+        Copy of the entity with the row's id and timestamps
+    """
+    update = {"id": data["id"]}
+    for field in ("created_at", "updated_at"):
+        if data.get(field):
+            update[field] = datetime.fromisoformat(data[field])
+    return entity.model_copy(update=update)
+
 
 class SupabaseTemplateRepository:
     """Template repository implementation using Supabase"""
     
+    __slots__ = ("_sb",)
+    
+    def __init__(self):
+        """Bind the shared Supabase client once for all queries"""
+        self._sb = get_supabase_client()
+    
     async def get_by_id(self, template_id: str) -> Optional[Template]:
         """Get template by ID"""
         try:
-            supabase = get_supabase_client()
-            result = supabase.table("message_templates").select("*").eq("id", template_id).execute()
+            result = self._sb.table("message_templates").select(_TEMPLATE_COLUMNS).eq("id", template_id).maybe_single().execute()
             
-            if not result.data:
+            if result is None or not result.data:
                 return None
             
-            data = result.data[0]
-            return Template(
-                id=data["id"],
-                name=data["name"],
-                type=TemplateType(data["type"]),
-                subject=data.get("subject"),
-                content=data["content"],
-                variables=data.get("variables", []),
-                is_active=data.get("is_active", True),
-                created_by=data.get("created_by"),
-                created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")) if isinstance(data["created_at"], str) else data["created_at"],
-                updated_at=datetime.fromisoformat(data["updated_at"].replace("Z", "+00:00")) if isinstance(data["updated_at"], str) else data["updated_at"]
-            )
+            return _row_to_template(result.data)
         except Exception as e:
             logger.error(f"Error fetching template: {str(e)}")
             return None
     
-    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Template]:
-        """Get all templates"""
+    async def get_all(self, skip: int = 0, limit: int = 100, columns: str = _TEMPLATE_COLUMNS) -> list[Template]:
+        """
+        Get all templates
+        
+        Args:
+            skip: Number of templates to skip
+            limit: Maximum number of templates to return
+            columns: Comma-separated columns to select; must include the
+                fields Template requires
+        
+        Returns:
+            List of templates
+        """
         try:
-            supabase = get_supabase_client()
-            result = supabase.table("message_templates").select("*").range(skip, skip + limit - 1).execute()
+            # No count: PostgREST would run a separate COUNT(*) over the table
+            result = (
+                self._sb.table("message_templates")
+                .select(columns, count=None)
+                .order("created_at", desc=True)
+                .range(skip, skip + limit - 1)
+                .execute()
+            )
             
-            templates = []
-            for data in result.data:
-                templates.append(Template(
-                    id=data["id"],
-                    name=data["name"],
-                    type=TemplateType(data["type"]),
-                    subject=data.get("subject"),
-                    content=data["content"],
-                    variables=data.get("variables", []),
-                    is_active=data.get("is_active", True),
-                    created_by=data.get("created_by"),
-                    created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")) if isinstance(data["created_at"], str) else data["created_at"],
-                    updated_at=datetime.fromisoformat(data["updated_at"].replace("Z", "+00:00")) if isinstance(data["updated_at"], str) else data["updated_at"]
-                ))
-            return templates
+            return list(map(_row_to_template, result.data))
         except Exception as e:
             logger.error(f"Error fetching templates: {str(e)}")
             return []
@@ -69,25 +102,10 @@ class SupabaseTemplateRepository:
     async def create(self, template: Template) -> Template:
         """Create a new template"""
         try:
-            supabase = get_supabase_client()
-            data = template.model_dump(exclude={"id", "created_at", "updated_at"})
-            data["type"] = template.type.value
-            
-            result = supabase.table("message_templates").insert(data).execute()
-            data = result.data[0]
+            data = template.model_dump(mode="json", exclude={"id", "created_at", "updated_at"})
             
-            return Template(
-                id=data["id"],
-                name=data["name"],
-                type=TemplateType(data["type"]),
-                subject=data.get("subject"),
-                content=data["content"],
-                variables=data.get("variables", []),
-                is_active=data.get("is_active", True),
-                created_by=data.get("created_by"),
-                created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")) if isinstance(data["created_at"], str) else data["created_at"],
-                updated_at=datetime.fromisoformat(data["updated_at"].replace("Z", "+00:00")) if isinstance(data["updated_at"], str) else data["updated_at"]
-            )
+            result = self._sb.table("message_templates").insert(data).execute()
+            return _with_server_fields(template, result.data[0])
         except Exception as e:
             logger.error(f"Error creating template: {str(e)}")
             raise
@@ -95,25 +113,10 @@ class SupabaseTemplateRepository:
     async def update(self, template_id: str, template: Template) -> Template:
         """Update a template"""
         try:
-            supabase = get_supabase_client()
-            data = template.model_dump(exclude={"id", "created_at", "updated_at"})
-            data["type"] = template.type.value
-            
-            result = supabase.table("message_templates").update(data).eq("id", template_id).execute()
-            data = result.data[0]
+            data = template.model_dump(mode="json", exclude={"id", "created_at", "updated_at"})
             
-            return Template(
-                id=data["id"],
-                name=data["name"],
-                type=TemplateType(data["type"]),
-                subject=data.get("subject"),
-                content=data["content"],
-                variables=data.get("variables", []),
-                is_active=data.get("is_active", True),
-                created_by=data.get("created_by"),
-                created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")) if isinstance(data["created_at"], str) else data["created_at"],
-                updated_at=datetime.fromisoformat(data["updated_at"].replace("Z", "+00:00")) if isinstance(data["updated_at"], str) else data["updated_at"]
-            )
+            result = self._sb.table("message_templates").update(data).eq("id", template_id).execute()
+            return _with_server_fields(template, result.data[0])
         except Exception as e:
             logger.error(f"Error updating template: {str(e)}")
             raise
@@ -121,8 +124,7 @@ class SupabaseTemplateRepository:
     async def delete(self, template_id: str) -> bool:
         """Delete a template"""
         try:
-            supabase = get_supabase_client()
-            supabase.table("message_templates").delete().eq("id", template_id).execute()
+            self._sb.table("message_templates").delete().eq("id", template_id).execute()
             return True
         except Exception as e:
             logger.error(f"Error deleting template: {str(e)}")
@@ -132,63 +134,48 @@ class SupabaseTemplateRepository:
 class SupabaseMessageLogRepository:
     """Message log repository implementation using Supabase"""
     
-    async def create(self, message_log: Dict[str, Any]) -> MessageLog:
+    __slots__ = ("_sb",)
+    
+    def __init__(self):
+        """Bind the shared Supabase client once for all queries"""
+        self._sb = get_supabase_client()
+    
+    @staticmethod
+    def _prepare(message_log: MessageLog) -> Dict[str, Any]:
+        """Convert a message log into a JSON-ready insert payload"""
+        return message_log.model_dump(mode="json")
+    
+    async def create(self, message_log: MessageLog) -> MessageLog:
         """Create a new message log"""
         try:
-            supabase = get_supabase_client()
-            data = message_log.copy()
-            data["type"] = message_log.get("type")
-            data["status"] = message_log.get("status", MessageStatus.FAILED).value if isinstance(message_log.get("status"), MessageStatus) else message_log.get("status")
-            
-            result = supabase.table("message_logs").insert(data).execute()
-            data = result.data[0]
-            
-            return MessageLog(
-                id=data["id"],
-                template_id=data.get("template_id"),
-                recipient_id=data.get("recipient_id"),
-                recipient_email=data.get("recipient_email"),
-                recipient_phone=data.get("recipient_phone"),
-                type=MessageType(data["type"]),
-                subject=data.get("subject"),
-                content=data["content"],
-                variables_used=data.get("variables_used", {}),
-                status=MessageStatus(data["status"]),
-                error_message=data.get("error_message"),
-                sent_at=datetime.fromisoformat(data["sent_at"].replace("Z", "+00:00")) if data.get("sent_at") and isinstance(data["sent_at"], str) else data.get("sent_at"),
-                delivered_at=datetime.fromisoformat(data["delivered_at"].replace("Z", "+00:00")) if data.get("delivered_at") and isinstance(data["delivered_at"], str) else data.get("delivered_at"),
-                created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")) if isinstance(data["created_at"], str) else data["created_at"]
-            )
+            result = self._sb.table("message_logs").insert(self._prepare(message_log)).execute()
+            return _row_to_message_log(result.data[0])
         except Exception as e:
             logger.error(f"Error creating message log: {str(e)}")
             raise
     
+    async def create_many(self, message_logs: list[MessageLog]) -> list[MessageLog]:
+        """Create several message logs with a single insert"""
+        try:
+            rows = [self._prepare(message_log) for message_log in message_logs]
+            # Batches are written by the background log writer; keep the
+            # synchronous round-trip off the event loop
+            result = await asyncio.to_thread(self._sb.table("message_logs").insert(rows).execute)
+            
+            return list(map(_row_to_message_log, result.data))
+        except Exception as e:
+            logger.error(f"Error creating message logs: {str(e)}")
+            raise
+    
     async def get_by_id(self, log_id: str) -> Optional[MessageLog]:
         """Get message log by ID"""
         try:
-            supabase = get_supabase_client()
-            result = supabase.table("message_logs").select("*").eq("id", log_id).execute()
+            result = self._sb.table("message_logs").select(_MESSAGE_LOG_COLUMNS).eq("id", log_id).maybe_single().execute()
             
-            if not result.data:
+            if result is None or not result.data:
                 return None
             
-            data = result.data[0]
-            return MessageLog(
-                id=data["id"],
-                template_id=data.get("template_id"),
-                recipient_id=data.get("recipient_id"),
-                recipient_email=data.get("recipient_email"),
-                recipient_phone=data.get("recipient_phone"),
-                type=MessageType(data["type"]),
-                subject=data.get("subject"),
-                content=data["content"],
-                variables_used=data.get("variables_used", {}),
-                status=MessageStatus(data["status"]),
-                error_message=data.get("error_message"),
-                sent_at=datetime.fromisoformat(data["sent_at"].replace("Z", "+00:00")) if data.get("sent_at") and isinstance(data["sent_at"], str) else data.get("sent_at"),
-                delivered_at=datetime.fromisoformat(data["delivered_at"].replace("Z", "+00:00")) if data.get("delivered_at") and isinstance(data["delivered_at"], str) else data.get("delivered_at"),
-                created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")) if isinstance(data["created_at"], str) else data["created_at"]
-            )
+            return _row_to_message_log(result.data)
         except Exception as e:
             logger.error(f"Error fetching message log: {str(e)}")
             return None
@@ -196,53 +183,69 @@ class SupabaseMessageLogRepository:
     async def get_by_template_id(self, template_id: str) -> list[MessageLog]:
         """Get message logs by template ID"""
         try:
-            supabase = get_supabase_client()
-            result = supabase.table("message_logs").select("*").eq("template_id", template_id).execute()
+            result = self._sb.table("message_logs").select(_MESSAGE_LOG_COLUMNS).eq("template_id", template_id).execute()
             
-            logs = []
-            for data in result.data:
-                logs.append(MessageLog(
-                    id=data["id"],
-                    template_id=data.get("template_id"),
-                    recipient_id=data.get("recipient_id"),
-                    recipient_email=data.get("recipient_email"),
-                    recipient_phone=data.get("recipient_phone"),
-                    type=MessageType(data["type"]),
-                    subject=data.get("subject"),
-                    content=data["content"],
-                    variables_used=data.get("variables_used", {}),
-                    status=MessageStatus(data["status"]),
-                    error_message=data.get("error_message"),
-                    sent_at=datetime.fromisoformat(data["sent_at"].replace("Z", "+00:00")) if data.get("sent_at") and isinstance(data["sent_at"], str) else data.get("sent_at"),
-                    delivered_at=datetime.fromisoformat(data["delivered_at"].replace("Z", "+00:00")) if data.get("delivered_at") and isinstance(data["delivered_at"], str) else data.get("delivered_at"),
-                    created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")) if isinstance(data["created_at"], str) else data["created_at"]
-                ))
-            return logs
+            return list(map(_row_to_message_log, result.data))
         except Exception as e:
             logger.error(f"Error fetching message logs: {str(e)}")
             return []
+    
+    async def aiter_by_template_id(self, template_id: str, chunk_size: int = 500) -> AsyncIterator[MessageLog]:
+        """
+        Iterate over message logs by template ID one page at a time
+        
+        Only one page of rows is held in memory, so callers can stream large
+        histories without materializing them.
+        
+        Args:
+            template_id: Template ID
+            chunk_size: Rows fetched per request
+        
+        Yields:
+            Message logs, oldest first
+        """
+        offset = 0
+        while True:
+            try:
+                result = (
+                    self._sb.table("message_logs")
+                    .select(_MESSAGE_LOG_COLUMNS, count=None)
+                    .eq("template_id", template_id)
+                    .order("created_at")
+                    .order("id")
+                    .range(offset, offset + chunk_size - 1)
+                    .execute()
+                )
+            except Exception as e:
+                logger.error(f"Error fetching message logs: {str(e)}")
+                raise
+            
+            for row in result.data:
+                yield _row_to_message_log(row)
+            
+            if len(result.data) < chunk_size:
+                return
+            offset += chunk_size
 
 
 class SupabaseOrganizationSettingsRepository:
     """Organization settings repository implementation using Supabase"""
     
+    __slots__ = ("_sb",)
+    
+    def __init__(self):
+        """Bind the shared Supabase client once for all queries"""
+        self._sb = get_supabase_client()
+    
     async def get_settings(self) -> Optional[OrganizationSettings]:
         """Get organization settings"""
         try:
-            supabase = get_supabase_client()
-            result = supabase.table("organization_settings").select("*").limit(1).execute()
+            result = self._sb.table("organization_settings").select(_ORGANIZATION_SETTINGS_COLUMNS).limit(1).maybe_single().execute()
             
-            if not result.data:
+            if result is None or not result.data:
                 return None
             
-            data = result.data[0]
-            return OrganizationSettings(
-                id=data.get("id"),
-                email_config=data.get("email_config"),
-                whatsapp_config=data.get("whatsapp_config"),
-                created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")) if data.get("created_at") and isinstance(data["created_at"], str) else data.get("created_at"),
-                updated_at=datetime.fromisoformat(data["updated_at"].replace("Z", "+00:00")) if data.get("updated_at") and isinstance(data["updated_at"], str) else data.get("updated_at")
-            )
+            return _row_to_organization_settings(result.data)
         except Exception as e:
             logger.error(f"Error fetching organization settings: {str(e)}")
             return None
@@ -250,30 +253,28 @@ class SupabaseOrganizationSettingsRepository:
     async def update_settings(self, settings: OrganizationSettings) -> OrganizationSettings:
         """Update organization settings"""
         try:
-            supabase = get_supabase_client()
-            data = settings.model_dump(exclude={"id", "created_at", "updated_at"})
-            
-            result = supabase.table("organization_settings").update(data).eq("id", settings.id).execute()
-            data = result.data[0]
+            data = settings.model_dump(mode="json", exclude={"id", "created_at", "updated_at"})
             
-            return OrganizationSettings(
-                id=data.get("id"),
-                email_config=data.get("email_config"),
-                whatsapp_config=data.get("whatsapp_config"),
-                created_at=datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")) if data.get("created_at") and isinstance(data["created_at"], str) else data.get("created_at"),
-                updated_at=datetime.fromisoformat(data["updated_at"].replace("Z", "+00:00")) if data.get("updated_at") and isinstance(data["updated_at"], str) else data.get("updated_at")
-            )
+            result = self._sb.table("organization_settings").update(data).eq("id", settings.id).execute()
+            return _with_server_fields(settings, result.data[0])
         except Exception as e:
             logger.error(f"Error updating organization settings: {str(e)}")
             raise
     
     async def get_email_config(self) -> Optional[Dict[str, Any]]:
         """Get email configuration"""
-        settings = await self.get_settings()
-        return settings.email_config if settings else None
+        return await self._get_config("email_config")
     
     async def get_whatsapp_config(self) -> Optional[Dict[str, Any]]:
         """Get WhatsApp configuration"""
-        settings = await self.get_settings()
-        return settings.whatsapp_config if settings else None
+        return await self._get_config("whatsapp_config")
+    
+    async def _get_config(self, column: str) -> Optional[Dict[str, Any]]:
+        """Read a single config column without building the settings entity"""
+        try:
+            result = self._sb.table("organization_settings").select(column).limit(1).maybe_single().execute()
+            return result.data.get(column) if result is not None and result.data else None
+        except Exception as e:
+            logger.error(f"Error fetching {column}: {str(e)}")
+            return None
 
@@ -0,0 +1,64 @@
+"""
+Shared Jinja2 environment for rendering message templates
+"""
+import logging
+import os
+from typing import Dict, Any, Optional, Union
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FunctionLoader, Template
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _create_bytecode_cache() -> Optional[BytecodeCache]:
+    """Create the on-disk bytecode cache if JINJA_CACHE_DIR is configured"""
+    if not settings.jinja_cache_dir:
+        return None
+    os.makedirs(settings.jinja_cache_dir, exist_ok=True)
+    return FileSystemBytecodeCache(directory=settings.jinja_cache_dir)
+
+
+# Process-wide environment. Templates are stored in the database, so the
+# loader treats the template source itself as the template name: Jinja then
+# keeps compiled templates in its in-memory cache and, when configured,
+# persists their bytecode so new workers skip the compile step.
+# Autoescape is explicitly off: WhatsApp templates are plain text, and email
+# output must keep matching plain Template() rendering, so neither channel
+# pays for escape wrapping at compile or render time.
+jinja_env = Environment(
+    loader=FunctionLoader(lambda source: source),
+    autoescape=False,
+    cache_size=512,
+    auto_reload=False,
+    bytecode_cache=_create_bytecode_cache()
+)
+
+
+def compile_template(template_content: str) -> Template:
+    """Get the compiled template for the given source"""
+    return jinja_env.get_template(template_content)
+
+
+def render(template_content: Union[str, Template], variables: Dict[str, Any]) -> str:
+    """
+    Render template source with variables
+    
+    Args:
+        template_content: Template source (Jinja2 syntax) or a template
+            already compiled with compile_template
+        variables: Variables to replace in template
+    
+    Returns:
+        Rendered template
+    
+    Raises:
+        ValueError: If the template fails to compile or render
+    """
+    try:
+        if not isinstance(template_content, Template):
+            template_content = compile_template(template_content)
+        return template_content.render(**variables)
+    except Exception as e:
+        logger.error("Failed to render template: %s", e)
+        raise ValueError(f"Template rendering failed: {str(e)}")
@@ -3,11 +3,12 @@ Communication API endpoints for JCI Connect
 Refactored to use hexagonal architecture with use cases
 """
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any
 import logging
 
 from app.application.schemas import (
-    SendMessageRequest, MessageResponse, TemplatePreviewRequest, TemplatePreviewResponse
+    SendMessageRequest, SendBatchRequest, MessageResponse, TemplatePreviewRequest, TemplatePreviewResponse
 )
 from app.application.use_cases.send_message_use_case import SendMessageUseCase
 from app.application.use_cases.preview_template_use_case import PreviewTemplateUseCase
@@ -21,11 +22,46 @@ from app.interfaces.api.dependencies import (
 )
 from app.infrastructure.adapters.email_adapter import EmailAdapter
 from app.infrastructure.adapters.whatsapp_adapter import WhatsAppAdapter
-from app.domain.value_objects import SMTPConfig, WhatsAppConfig
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/communication", tags=["communication"])
+router = APIRouter(
+    prefix="/api/communication",
+    tags=["communication"],
+    default_response_class=ORJSONResponse
+)
+
+# Status codes for the errors the use cases raise; anything else is a 500
+_ERROR_MAP = {
+    TemplateNotFoundError: status.HTTP_404_NOT_FOUND,
+    ConfigurationNotFoundError: status.HTTP_404_NOT_FOUND,
+    InvalidTemplateTypeError: status.HTTP_400_BAD_REQUEST,
+    MessageSendError: status.HTTP_500_INTERNAL_SERVER_ERROR,
+    ValueError: status.HTTP_400_BAD_REQUEST
+}
+
+
+def _http_error(e: Exception, action: str) -> HTTPException:
+    """
+    Log a use case error and map it to an HTTP error
+    
+    Args:
+        e: Raised exception
+        action: What failed, used in the log line and unmapped error details
+        
+    Returns:
+        HTTPException to raise
+    """
+    logger.error("%s: %s", action, e)
+    # Walk the MRO so subclasses (e.g. pydantic's ValidationError) map like their base
+    for error_type in type(e).__mro__:
+        status_code = _ERROR_MAP.get(error_type)
+        if status_code is not None:
+            return HTTPException(status_code=status_code, detail=str(e))
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"{action}: {str(e)}"
+    )
 
 
 @router.post("/send-message", response_model=MessageResponse)
@@ -57,30 +93,40 @@ async def send_message(
             data=result
         )
         
-    except (TemplateNotFoundError, ConfigurationNotFoundError, InvalidTemplateTypeError) as e:
-        logger.error(f"Failed to send message: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND if isinstance(e, (TemplateNotFoundError, ConfigurationNotFoundError)) else status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    except MessageSendError as e:
-        logger.error(f"Failed to send message: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+    except Exception as e:
+        raise _http_error(e, "Failed to send message")
+
+
+@router.post("/send-batch", response_model=MessageResponse)
+async def send_batch(
+    batch_data: SendBatchRequest,
+    send_message_use_case: SendMessageUseCase = Depends(get_send_message_use_case)
+) -> MessageResponse:
+    """
+    Send a template to many recipients
+    
+    Args:
+        batch_data: Batch sending data
+        send_message_use_case: Send message use case
+        
+    Returns:
+        MessageResponse with per-recipient results
+    """
+    try:
+        result = await send_message_use_case.execute_batch(
+            template_id=batch_data.template_id,
+            recipients=batch_data.recipients,
+            variables_per_recipient=batch_data.variables_per_recipient
         )
-    except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
+        
+        return MessageResponse(
+            success=result["success"],
+            message=result["message"],
+            data=result
         )
+        
     except Exception as e:
-        logger.error(f"Failed to send message: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to send message: {str(e)}"
-        )
+        raise _http_error(e, "Failed to send batch")
 
 
 @router.post("/preview-template", response_model=TemplatePreviewResponse)
@@ -110,18 +156,8 @@ async def preview_template(
             variables_used=result["variables_used"]
         )
         
-    except (TemplateNotFoundError, ValueError) as e:
-        logger.error(f"Failed to preview template: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND if isinstance(e, TemplateNotFoundError) else status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
     except Exception as e:
-        logger.error(f"Failed to preview template: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to preview template: {str(e)}"
-        )
+        raise _http_error(e, "Failed to preview template")
 
 
 @router.post("/test-email", response_model=MessageResponse)
@@ -142,17 +178,15 @@ async def test_email_connection(
     try:
         org_settings_repo = get_organization_settings_repository()
         
-        email_config_data = await org_settings_repo.get_email_config()
+        smtp_config = await org_settings_repo.get_smtp_config()
         
-        if not email_config_data:
+        if smtp_config is None:
             return MessageResponse(
                 success=False,
                 message="Email configuration not found in database",
                 data={"error": "No email configuration found"}
             )
         
-        smtp_config = SMTPConfig(**email_config_data)
-        
         # Test connection
         connection_result = await email_adapter.test_connection(smtp_config)
         
@@ -182,7 +216,7 @@ async def test_email_connection(
         )
         
     except Exception as e:
-        logger.error(f"Email test failed: {str(e)}")
+        logger.error("Email test failed: %s", e)
         return MessageResponse(
             success=False,
             message=f"Email test failed: {str(e)}",
@@ -208,17 +242,15 @@ async def test_whatsapp_connection(
     try:
         org_settings_repo = get_organization_settings_repository()
         
-        whatsapp_config_data = await org_settings_repo.get_whatsapp_config()
+        wa_config = await org_settings_repo.get_whatsapp_api_config()
         
-        if not whatsapp_config_data:
+        if wa_config is None:
             return MessageResponse(
                 success=False,
                 message="WhatsApp configuration not found in database",
                 data={"error": "No WhatsApp configuration found"}
             )
         
-        wa_config = WhatsAppConfig(**whatsapp_config_data)
-        
         # Test connection
         connection_result = await whatsapp_adapter.test_connection(wa_config)
         
@@ -248,7 +280,7 @@ async def test_whatsapp_connection(
         )
         
     except Exception as e:
-        logger.error(f"WhatsApp test failed: {str(e)}")
+        logger.error("WhatsApp test failed: %s", e)
         return MessageResponse(
             success=False,
             message=f"WhatsApp test failed: {str(e)}",
@@ -270,21 +302,17 @@ async def get_whatsapp_status(
         MessageResponse with WhatsApp status
     """
     try:
-        from app.interfaces.api.dependencies import get_organization_settings_repository
         org_settings_repo = get_organization_settings_repository()
         
-        whatsapp_config_data = await org_settings_repo.get_whatsapp_config()
+        wa_config = await org_settings_repo.get_whatsapp_api_config()
         
-        if not whatsapp_config_data:
+        if wa_config is None:
             return MessageResponse(
                 success=False,
                 message="WhatsApp configuration not found",
                 data={"error": "No WhatsApp configuration"}
             )
         
-        from app.domain.value_objects import WhatsAppConfig
-        wa_config = WhatsAppConfig(**whatsapp_config_data)
-        
         status_result = await whatsapp_adapter.get_instance_status(wa_config)
         
         return MessageResponse(
@@ -294,7 +322,7 @@ async def get_whatsapp_status(
         )
         
     except Exception as e:
-        logger.error(f"Failed to get WhatsApp status: {str(e)}")
+        logger.error("Failed to get WhatsApp status: %s", e)
         return MessageResponse(
             success=False,
             message=f"Failed to get WhatsApp status: {str(e)}",
@@ -316,21 +344,17 @@ async def get_whatsapp_qr(
         MessageResponse with QR code data
     """
     try:
-        from app.interfaces.api.dependencies import get_organization_settings_repository
         org_settings_repo = get_organization_settings_repository()
         
-        whatsapp_config_data = await org_settings_repo.get_whatsapp_config()
+        wa_config = await org_settings_repo.get_whatsapp_api_config()
         
-        if not whatsapp_config_data:
+        if wa_config is None:
             return MessageResponse(
                 success=False,
                 message="WhatsApp configuration not found",
                 data={"error": "No WhatsApp configuration"}
             )
         
-        from app.domain.value_objects import WhatsAppConfig
-        wa_config = WhatsAppConfig(**whatsapp_config_data)
-        
         qr_result = await whatsapp_adapter.get_qr_code(wa_config)
         
         return MessageResponse(
@@ -340,7 +364,7 @@ async def get_whatsapp_qr(
         )
         
     except Exception as e:
-        logger.error(f"Failed to get WhatsApp QR code: {str(e)}")
+        logger.error("Failed to get WhatsApp QR code: %s", e)
         return MessageResponse(
             success=False,
             message=f"Failed to get WhatsApp QR code: {str(e)}",
@@ -1,56 +1,100 @@
 """
 Dependency injection for the API layer
 """
+from functools import lru_cache
+
+from app.core.config import settings
+from app.application.ports.template_repository import TemplateRepository
+from app.application.ports.message_log_repository import MessageLogRepository
 from app.infrastructure.database.supabase_adapter import (
     SupabaseTemplateRepository,
     SupabaseMessageLogRepository,
     SupabaseOrganizationSettingsRepository
 )
+from app.infrastructure.database.postgres_adapter import (
+    PostgresTemplateRepository,
+    PostgresMessageLogRepository,
+    PostgresOrganizationSettingsRepository
+)
+from app.infrastructure.database.cached_settings_repository import CachedOrganizationSettingsRepository
+from app.infrastructure.database.cached_template_repository import CachedTemplateRepository
 from app.infrastructure.adapters.email_adapter import EmailAdapter
 from app.infrastructure.adapters.whatsapp_adapter import WhatsAppAdapter
 from app.application.use_cases.send_message_use_case import SendMessageUseCase
 from app.application.use_cases.preview_template_use_case import PreviewTemplateUseCase
+from app.application.message_log_writer import MessageLogWriter
 
 
-def get_template_repository() -> SupabaseTemplateRepository:
-    """Get template repository instance"""
+# Repositories, adapters and use cases are shared by all requests: the
+# adapters hold connection pools and the caching settings repository and log
+# writer keep process-wide state. When DATABASE_URL is configured the
+# repositories query Postgres over the asyncpg pool instead of the Supabase
+# REST client, whose calls block the event loop
+
+@lru_cache(maxsize=1)
+def get_template_repository() -> TemplateRepository:
+    """Get the shared template repository"""
+    if settings.database_url:
+        return PostgresTemplateRepository()
     return SupabaseTemplateRepository()
 
 
-def get_message_log_repository() -> SupabaseMessageLogRepository:
-    """Get message log repository instance"""
+@lru_cache(maxsize=1)
+def get_cached_template_repository() -> CachedTemplateRepository:
+    """Get the shared template repository that caches lookups by ID for sends"""
+    return CachedTemplateRepository(get_template_repository())
+
+
+@lru_cache(maxsize=1)
+def get_message_log_repository() -> MessageLogRepository:
+    """Get the shared message log repository"""
+    if settings.database_url:
+        return PostgresMessageLogRepository()
     return SupabaseMessageLogRepository()
 
 
-def get_organization_settings_repository() -> SupabaseOrganizationSettingsRepository:
-    """Get organization settings repository instance"""
-    return SupabaseOrganizationSettingsRepository()
+@lru_cache(maxsize=1)
+def get_organization_settings_repository() -> CachedOrganizationSettingsRepository:
+    """Get the shared organization settings repository, which caches reads for a short TTL"""
+    if settings.database_url:
+        return CachedOrganizationSettingsRepository(PostgresOrganizationSettingsRepository())
+    return CachedOrganizationSettingsRepository(SupabaseOrganizationSettingsRepository())
+
 
+@lru_cache(maxsize=1)
+def get_message_log_writer() -> MessageLogWriter:
+    """Get the shared message log writer, started and stopped with the app"""
+    return MessageLogWriter(get_message_log_repository())
 
+
+@lru_cache(maxsize=1)
 def get_email_adapter() -> EmailAdapter:
-    """Get email adapter instance"""
+    """Get the shared email adapter"""
     return EmailAdapter()
 
 
+@lru_cache(maxsize=1)
 def get_whatsapp_adapter() -> WhatsAppAdapter:
-    """Get WhatsApp adapter instance"""
+    """Get the shared WhatsApp adapter"""
     return WhatsAppAdapter()
 
 
+@lru_cache(maxsize=1)
 def get_send_message_use_case() -> SendMessageUseCase:
-    """Get send message use case instance"""
+    """Get the shared send message use case"""
     return SendMessageUseCase(
-        template_repository=get_template_repository(),
+        template_repository=get_cached_template_repository(),
         message_log_repository=get_message_log_repository(),
         organization_settings_repository=get_organization_settings_repository(),
         email_sender=get_email_adapter(),
-        whatsapp_sender=get_whatsapp_adapter()
+        whatsapp_sender=get_whatsapp_adapter(),
+        message_log_writer=get_message_log_writer()
     )
 
 
+@lru_cache(maxsize=1)
 def get_preview_template_use_case() -> PreviewTemplateUseCase:
-    """Get preview template use case instance"""
+    """Get the shared preview template use case"""
     return PreviewTemplateUseCase(
         template_repository=get_template_repository()
     )
-
@@ -2,10 +2,12 @@
 Pydantic schemas for API requests and responses
 """
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from enum import Enum
 
+from app.domain.value_objects import EmailAddress
+
 
 class MessageType(str, Enum):
     """Message type enumeration"""
@@ -54,26 +56,27 @@ class TemplateUpdate(BaseModel):
 
 class Template(TemplateBase):
     """Complete template schema"""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: str
     created_by: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # Message Schemas
 class MessageSend(BaseModel):
     """Schema for sending a message"""
     template_id: str
-    recipient_email: Optional[EmailStr] = None
+    recipient_email: Optional[EmailAddress] = None
     recipient_phone: Optional[str] = None
     variables: Dict[str, Any] = Field(default_factory=dict)
 
 
 class MessageLog(BaseModel):
     """Message log schema"""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: str
     template_id: Optional[str] = None
     recipient_id: Optional[str] = None
@@ -89,13 +92,12 @@ class MessageLog(BaseModel):
     delivered_at: Optional[datetime] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 # Configuration Schemas
 class SMTPConfig(BaseModel):
     """SMTP configuration schema"""
+    model_config = ConfigDict(frozen=True)
+    
     host: str
     port: int = 587
     username: str
@@ -107,6 +109,8 @@ class SMTPConfig(BaseModel):
 
 class WhatsAppConfig(BaseModel):
     """WhatsApp Evolution API configuration schema"""
+    model_config = ConfigDict(frozen=True)
+    
     api_url: str
     api_key: str
     instance_name: str
@@ -115,6 +119,8 @@ class WhatsAppConfig(BaseModel):
 
 class CommunicationConfig(BaseModel):
     """Communication configuration schema"""
+    model_config = ConfigDict(frozen=True)
+    
     smtp: Optional[SMTPConfig] = None
     whatsapp: Optional[WhatsAppConfig] = None
 
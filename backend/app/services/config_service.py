@@ -1,12 +1,30 @@
 """
 Configuration service for retrieving organization settings from Supabase
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, TypeVar
 from supabase import Client
+import asyncio
 import logging
 
+from app.models.schemas import SMTPConfig, WhatsAppConfig, CommunicationConfig
+from app.services.email_service import build_smtp_config
+from app.services.whatsapp_service import build_whatsapp_config
+from app.utils.cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Organization settings shared by every ConfigService instance (one is
+# created per request). The lock lets concurrent misses share one fetch.
+SETTINGS_TTL = 30.0
+_settings_cache = TTLCache(ttl=SETTINGS_TTL, maxsize=3)
+_settings_lock = asyncio.Lock()
+
+# Only the config columns are read, so only they are fetched
+_SETTINGS_COLUMNS = "email_config,whatsapp_config"
+
+_ConfigT = TypeVar("_ConfigT", SMTPConfig, WhatsAppConfig)
+
+
 class ConfigService:
     """Service for managing organization configuration"""
     
@@ -14,17 +32,45 @@ class ConfigService:
         self.supabase = supabase_client
     
     async def get_organization_settings(self) -> Dict[str, Any]:
+        """Get organization settings, cached for SETTINGS_TTL seconds"""
+        org_settings = _settings_cache.get("org_settings")
+        if org_settings is not None:
+            return org_settings
+        
+        async with _settings_lock:
+            # Another request may have refreshed the cache while we waited
+            org_settings = _settings_cache.get("org_settings")
+            if org_settings is None:
+                org_settings = await self._fetch_organization_settings()
+                if org_settings:
+                    _settings_cache.set("org_settings", org_settings)
+        return org_settings
+    
+    @staticmethod
+    def invalidate() -> None:
+        """Drop the cached settings so the next read refetches them"""
+        _settings_cache.clear()
+    
+    async def _fetch_organization_settings(self) -> Dict[str, Any]:
         """Get organization settings from database"""
         try:
-            response = self.supabase.from_("organization_settings").select("*").limit(1).execute()
+            query = (
+                self.supabase.from_("organization_settings")
+                .select(_SETTINGS_COLUMNS)
+                .limit(1)
+                .maybe_single()
+            )
+            # supabase-py is synchronous; keep the round-trip off the event loop
+            response = await asyncio.to_thread(query.execute)
             
-            if not response.data:
+            # maybe_single() returns None rather than an empty list when no row exists
+            if response is None:
                 logger.warning("No organization settings found")
                 return {}
             
-            return response.data[0]
+            return response.data
         except Exception as e:
-            logger.error(f"Error fetching organization settings: {e}")
+            logger.error("Error fetching organization settings: %s", e)
             return {}
     
     async def get_email_config(self) -> Dict[str, Any]:
@@ -37,6 +83,54 @@ class ConfigService:
         settings = await self.get_organization_settings()
         return settings.get("whatsapp_config", {})
     
+    async def get_smtp_config(self) -> Optional[SMTPConfig]:
+        """Get the validated SMTP configuration, or None if not configured"""
+        return await self._get_config_object("smtp_config", "email_config", build_smtp_config)
+    
+    async def get_whatsapp_api_config(self) -> Optional[WhatsAppConfig]:
+        """Get the validated WhatsApp configuration, or None if not configured"""
+        return await self._get_config_object("whatsapp_api_config", "whatsapp_config", build_whatsapp_config)
+    
+    async def get_communication_config(self) -> CommunicationConfig:
+        """Get the validated SMTP and WhatsApp configurations together"""
+        return CommunicationConfig(
+            smtp=await self.get_smtp_config(),
+            whatsapp=await self.get_whatsapp_api_config()
+        )
+    
+    async def _get_config_object(
+        self,
+        key: str,
+        field: str,
+        build: Callable[[Dict[str, Any]], _ConfigT]
+    ) -> Optional[_ConfigT]:
+        """
+        Get a config object built from the cached settings
+        
+        The config is validated once per settings fetch and shared until the
+        settings expire or are invalidated.
+        
+        Args:
+            key: Cache key for the built config
+            field: Settings column holding the raw config
+            build: Function validating the raw config
+            
+        Returns:
+            Validated config, or None if the column is empty
+        """
+        settings = await self.get_organization_settings()
+        config_data = settings.get(field)
+        if not config_data:
+            return None
+        
+        cached = _settings_cache.get(key)
+        if cached is not None and cached[0] is settings:
+            return cached[1]
+        
+        config = build(config_data)
+        _settings_cache.set(key, (settings, config))
+        return config
+    
     async def is_email_enabled(self) -> bool:
         """Check if email service is enabled"""
         email_config = await self.get_email_config()
@@ -2,42 +2,119 @@
 SMTP Email Service for JCI Connect
 Handles sending emails using SMTP configuration
 """
+import asyncio
+import time
 import aiosmtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
 from email.utils import formataddr
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import logging
-from jinja2 import Template
 
 from app.core.config import settings
 from app.models.schemas import SMTPConfig, MessageStatus
+from app.services.rendering import render_cached
 
 logger = logging.getLogger(__name__)
 
+# Seconds the SMTP session may sit idle before it is checked with a NOOP
+SMTP_KEEPALIVE_INTERVAL = 30.0
+
+
+def build_smtp_config(email_config: Optional[Dict[str, Any]]) -> SMTPConfig:
+    """
+    Validate an email configuration into an SMTPConfig
+    
+    Args:
+        email_config: Email configuration from organization_settings.email_config
+        
+    Returns:
+        SMTPConfig with defaults for any missing keys
+    """
+    if not email_config:
+        email_config = {}
+    
+    return SMTPConfig(
+        host=email_config.get("smtp_host", ""),
+        port=email_config.get("smtp_port", 587),
+        username=email_config.get("smtp_username", ""),
+        password=email_config.get("smtp_password", ""),
+        use_tls=email_config.get("smtp_use_tls", True),
+        from_email=email_config.get("from_email", ""),
+        from_name=email_config.get("from_name", "JCI Connect")
+    )
+
 
 class EmailService:
     """Service for sending emails via SMTP"""
     
-    def __init__(self, email_config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        email_config: Optional[Dict[str, Any]] = None,
+        smtp_config: Optional[SMTPConfig] = None
+    ):
         """
         Initialize email service with SMTP configuration from database
         
         Args:
             email_config: Email configuration from organization_settings.email_config
+            smtp_config: Already validated configuration, e.g. from
+                ConfigService.get_smtp_config; takes precedence over email_config
+        """
+        self.config = smtp_config if smtp_config is not None else build_smtp_config(email_config)
+        self._from_header = formataddr((self.config.from_name, self.config.from_email))
+        # The config is frozen, so its validation result never changes
+        self._validation = self._compute_validation()
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._last_used = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def _get_smtp(self) -> aiosmtplib.SMTP:
         """
-        if not email_config:
-            email_config = {}
+        Get the connected, authenticated SMTP session, opening it on first use
+        
+        The session is reused by later sends. After SMTP_KEEPALIVE_INTERVAL
+        idle seconds it is checked with a NOOP and reopened if the server
+        dropped it. Callers must hold the lock.
+        
+        Returns:
+            Connected SMTP client
+        """
+        if self._smtp is not None:
+            if not self._smtp.is_connected:
+                await self._close_smtp()
+            elif time.monotonic() - self._last_used > SMTP_KEEPALIVE_INTERVAL:
+                try:
+                    await self._smtp.noop()
+                except aiosmtplib.SMTPException:
+                    await self._close_smtp()
+        
+        if self._smtp is None:
+            smtp = aiosmtplib.SMTP(
+                hostname=self.config.host,
+                port=self.config.port,
+                use_tls=self.config.use_tls,
+                start_tls=self.config.use_tls
+            )
+            await smtp.connect()
+            await smtp.login(self.config.username, self.config.password)
+            self._smtp = smtp
         
-        self.config = SMTPConfig(
-            host=email_config.get("smtp_host", ""),
-            port=email_config.get("smtp_port", 587),
-            username=email_config.get("smtp_username", ""),
-            password=email_config.get("smtp_password", ""),
-            use_tls=email_config.get("smtp_use_tls", True),
-            from_email=email_config.get("from_email", ""),
-            from_name=email_config.get("from_name", "JCI Connect")
-        )
+        self._last_used = time.monotonic()
+        return self._smtp
+    
+    async def _close_smtp(self) -> None:
+        """Close the open SMTP session, if any"""
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None and smtp.is_connected:
+            try:
+                await smtp.quit()
+            except aiosmtplib.SMTPException:
+                smtp.close()
+    
+    async def close(self) -> None:
+        """Close the SMTP session"""
+        async with self._lock:
+            await self._close_smtp()
     
     async def send_email(
         self,
@@ -67,32 +144,28 @@ class EmailService:
                     "status": MessageStatus.FAILED
                 }
             
-            # Create message
-            message = MIMEMultipart("alternative")
+            # Create message with a single body part
+            message = EmailMessage()
             message["Subject"] = subject
-            message["From"] = formataddr((self.config.from_name, self.config.from_email))
+            message["From"] = self._from_header
             message["To"] = to_email
+            message.set_content(content, subtype="html" if is_html else "plain", charset="utf-8")
             
-            # Add content
-            if is_html:
-                html_part = MIMEText(content, "html", "utf-8")
-                message.attach(html_part)
-            else:
-                text_part = MIMEText(content, "plain", "utf-8")
-                message.attach(text_part)
-            
-            # Send email
-            await aiosmtplib.send(
-                message,
-                hostname=self.config.host,
-                port=self.config.port,
-                username=self.config.username,
-                password=self.config.password,
-                use_tls=self.config.use_tls,
-                start_tls=self.config.use_tls
-            )
+            # Send over the shared session, reconnecting once if the server
+            # closed it since the last send
+            async with self._lock:
+                try:
+                    smtp = await self._get_smtp()
+                    await smtp.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    await self._close_smtp()
+                    smtp = await self._get_smtp()
+                    await smtp.send_message(message)
+                except Exception:
+                    await self._close_smtp()
+                    raise
             
-            logger.info(f"Email sent successfully to {to_email}")
+            logger.info("Email sent successfully to %s", to_email)
             return {
                 "success": True,
                 "message": "Email sent successfully",
@@ -102,13 +175,15 @@ class EmailService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to send email to {to_email}: {str(e)}")
+            logger.error("Failed to send email to %s: %s", to_email, e)
             return {
                 "success": False,
                 "error": str(e),
                 "status": MessageStatus.FAILED,
                 "recipient": to_email,
-                "subject": subject
+                "subject": subject,
+                # 4xx SMTP replies (e.g. 421/451 throttling) are transient
+                "retryable": isinstance(e, aiosmtplib.SMTPResponseException) and 400 <= e.code < 500
             }
     
     def render_template(
@@ -127,10 +202,9 @@ class EmailService:
             Rendered content
         """
         try:
-            template = Template(template_content)
-            return template.render(**variables)
+            return render_cached(template_content, variables)
         except Exception as e:
-            logger.error(f"Failed to render template: {str(e)}")
+            logger.error("Failed to render template: %s", e)
             raise ValueError(f"Template rendering failed: {str(e)}")
     
     async def send_template_email(
@@ -170,7 +244,7 @@ class EmailService:
             )
             
         except Exception as e:
-            logger.error(f"Failed to send template email to {to_email}: {str(e)}")
+            logger.error("Failed to send template email to %s: %s", to_email, e)
             return {
                 "success": False,
                 "error": str(e),
@@ -178,10 +252,83 @@ class EmailService:
                 "recipient": to_email
             }
     
+    async def send_template_email_bulk(
+        self,
+        recipients: List[Dict[str, Any]],
+        template_content: str,
+        subject: str,
+        variables: Dict[str, Any],
+        is_html: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Send a template email to many recipients
+        
+        Subject and content are rendered once with the shared variables;
+        only recipients that carry their own variables are rendered again.
+        Emails go out one after another over the service's single SMTP
+        session, which carries one transaction at a time.
+        
+        Args:
+            recipients: Dicts with "email" and optional "variables", which
+                override the shared variables for that recipient
+            template_content: Email template content
+            subject: Email subject (can contain variables)
+            variables: Variables shared by all recipients
+            is_html: Whether content is HTML (default: True)
+            
+        Returns:
+            One result dict per recipient, in order
+        """
+        try:
+            shared_subject = self.render_template(subject, variables)
+            shared_content = self.render_template(template_content, variables)
+        except Exception as e:
+            logger.error("Failed to render bulk email template: %s", e)
+            return [{
+                "success": False,
+                "error": str(e),
+                "status": MessageStatus.FAILED,
+                "recipient": recipient.get("email")
+            } for recipient in recipients]
+        
+        results = []
+        for recipient in recipients:
+            if not recipient.get("variables"):
+                result = await self.send_email(
+                    to_email=recipient["email"],
+                    subject=shared_subject,
+                    content=shared_content,
+                    is_html=is_html
+                )
+            else:
+                result = await self.send_template_email(
+                    to_email=recipient["email"],
+                    template_content=template_content,
+                    subject=subject,
+                    variables={**variables, **recipient["variables"]},
+                    is_html=is_html
+                )
+            results.append(result)
+        return results
+    
     def validate_config(self) -> Dict[str, Any]:
         """
         Validate SMTP configuration
         
+        Returns:
+            Dict with validation status and details, computed once at construction
+        """
+        return self._validation
+    
+    def _compute_validation(self) -> Dict[str, Any]:
+        """
+        Check the SMTP configuration and build the validate_config result
+        
+        These checks stay here rather than as required-field constraints on
+        the schema: build_smtp_config fills missing settings with "", and
+        send_email reports such a config as incomplete instead of the
+        service failing to construct.
+        
         Returns:
             Dict with validation status and details
         """
@@ -223,24 +370,15 @@ class EmailService:
             Dict with connection test results
         """
         try:
-            # Create a test message
-            test_message = MIMEText("This is a test email from JCI Connect.", "plain", "utf-8")
-            test_message["Subject"] = "JCI Connect - SMTP Test"
-            test_message["From"] = formataddr((self.config.from_name, self.config.from_email))
-            test_message["To"] = self.config.from_email  # Send to self for testing
-            
-            # Try to send (but don't actually send)
-            # This will test the connection without sending an email
-            smtp = aiosmtplib.SMTP(
-                hostname=self.config.host,
-                port=self.config.port,
-                use_tls=self.config.use_tls,
-                start_tls=self.config.use_tls
-            )
-            
-            await smtp.connect()
-            await smtp.login(self.config.username, self.config.password)
-            await smtp.quit()
+            # Open (or reuse) the session and make sure the server answers,
+            # without sending an email
+            async with self._lock:
+                try:
+                    smtp = await self._get_smtp()
+                    await smtp.noop()
+                except Exception:
+                    await self._close_smtp()
+                    raise
             
             return {
                 "success": True,
@@ -250,7 +388,7 @@ class EmailService:
             }
             
         except Exception as e:
-            logger.error(f"SMTP connection test failed: {str(e)}")
+            logger.error("SMTP connection test failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
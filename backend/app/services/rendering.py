@@ -0,0 +1,105 @@
+"""
+Template rendering for JCI Connect
+Renders message templates with the shared Jinja2 environment
+"""
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import json
+import logging
+
+from app.infrastructure.templating import compile_template
+
+logger = logging.getLogger(__name__)
+
+# Rendered output keyed by template source and encoded variables, least
+# recently used first
+_RENDER_CACHE_SIZE = 256
+_render_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _is_plain_json(value: Any) -> bool:
+    """
+    Check that a value survives a JSON round-trip unchanged
+    
+    Tuples, non-str dict keys and subclasses of the JSON types would all
+    come back as something else, so they are rejected.
+    
+    Args:
+        value: Value to check
+    
+    Returns:
+        True if the value is built only from dicts with str keys, lists and scalars
+    """
+    value_type = type(value)
+    if value_type in _JSON_SCALARS:
+        return True
+    if value_type is dict:
+        return all(type(key) is str and _is_plain_json(item) for key, item in value.items())
+    if value_type is list:
+        return all(_is_plain_json(item) for item in value)
+    return False
+
+
+def _variables_key(variables: Dict[str, Any]) -> Optional[str]:
+    """Encode variables as a cache key, or None if they are not plain JSON"""
+    if not _is_plain_json(variables):
+        return None
+    try:
+        return json.dumps(variables, sort_keys=True)
+    except ValueError:
+        # Out-of-range floats
+        return None
+
+
+def render_cached(template_content: str, variables: Dict[str, Any]) -> str:
+    """
+    Render template content with variables, reusing output for repeated inputs
+    
+    Broadcasts often send one template with identical variables to every
+    recipient; those sends then render once instead of once per recipient.
+    The encoded variables are only used as the cache key; output is always
+    rendered from the variables as given. Variables that are not plain JSON
+    are rendered without caching.
+    
+    Args:
+        template_content: Template content with Jinja2 syntax
+        variables: Variables to replace in template
+    
+    Returns:
+        Rendered content
+    """
+    variables_key = _variables_key(variables)
+    if variables_key is None:
+        return compile_template(template_content).render(**variables)
+    
+    cache_key = (template_content, variables_key)
+    rendered = _render_cache.get(cache_key)
+    if rendered is not None:
+        _render_cache.move_to_end(cache_key)
+        return rendered
+    
+    rendered = compile_template(template_content).render(**variables)
+    _render_cache[cache_key] = rendered
+    if len(_render_cache) > _RENDER_CACHE_SIZE:
+        _render_cache.popitem(last=False)
+    return rendered
+
+
+def render_template(template_content: str, variables: Dict[str, Any]) -> str:
+    """
+    Render template content with variables
+    
+    Args:
+        template_content: Template content with Jinja2 syntax
+        variables: Variables to replace in template
+    
+    Returns:
+        Rendered content
+    """
+    try:
+        return render_cached(template_content, variables)
+    except Exception as e:
+        logger.error("Failed to render template: %s", e)
+        raise ValueError(f"Template rendering failed: {str(e)}")
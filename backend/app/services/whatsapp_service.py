@@ -2,36 +2,89 @@
 WhatsApp Evolution API Service for JCI Connect
 Handles sending WhatsApp messages using Evolution API
 """
+import asyncio
 import httpx
 import logging
+import orjson
 from typing import Optional, Dict, Any, List
-from jinja2 import Template
 
 from app.core.config import settings
 from app.models.schemas import WhatsAppConfig, MessageStatus
+from app.services.rendering import render_cached
+from app.utils.evolution_api import format_phone_number, get_message_id, get_instance_state
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of messages a bulk send has in flight at once; kept low
+# because Evolution API rate limits per instance
+BULK_CONCURRENCY = 5
+
+# HTTP client shared by every WhatsAppService, so connections to Evolution
+# API stay alive between messages instead of a new TLS handshake per send
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use"""
+    global _http_client
+    
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=30.0
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client"""
+    global _http_client
+    
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def build_whatsapp_config(whatsapp_config: Optional[Dict[str, Any]]) -> WhatsAppConfig:
+    """
+    Validate a WhatsApp configuration into a WhatsAppConfig
+    
+    Args:
+        whatsapp_config: WhatsApp configuration from organization_settings.whatsapp_config
+        
+    Returns:
+        WhatsAppConfig with defaults for any missing keys
+    """
+    if not whatsapp_config:
+        whatsapp_config = {}
+    
+    return WhatsAppConfig(
+        api_url=whatsapp_config.get("api_url", ""),
+        api_key=whatsapp_config.get("api_key", ""),
+        instance_name=whatsapp_config.get("instance_name", ""),
+        webhook_url=whatsapp_config.get("webhook_url")
+    )
+
 
 class WhatsAppService:
     """Service for sending WhatsApp messages via Evolution API"""
     
-    def __init__(self, whatsapp_config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        whatsapp_config: Optional[Dict[str, Any]] = None,
+        api_config: Optional[WhatsAppConfig] = None
+    ):
         """
         Initialize WhatsApp service with Evolution API configuration from database
         
         Args:
             whatsapp_config: WhatsApp configuration from organization_settings.whatsapp_config
+            api_config: Already validated configuration, e.g. from
+                ConfigService.get_whatsapp_api_config; takes precedence over whatsapp_config
         """
-        if not whatsapp_config:
-            whatsapp_config = {}
-        
-        self.config = WhatsAppConfig(
-            api_url=whatsapp_config.get("api_url", ""),
-            api_key=whatsapp_config.get("api_key", ""),
-            instance_name=whatsapp_config.get("instance_name", ""),
-            webhook_url=whatsapp_config.get("webhook_url")
-        )
+        self.config = api_config if api_config is not None else build_whatsapp_config(whatsapp_config)
+        # The config is frozen, so its validation result never changes
+        self._validation = self._compute_validation()
     
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for Evolution API requests"""
@@ -50,19 +103,7 @@ class WhatsAppService:
         Returns:
             Formatted phone number
         """
-        # Remove all non-digit characters
-        digits_only = ''.join(filter(str.isdigit, phone))
-        
-        # If number doesn't start with country code, assume it's a local number
-        # You might want to customize this based on your default country
-        if len(digits_only) == 10:  # US/Canada local number
-            digits_only = "1" + digits_only
-        elif len(digits_only) == 11 and digits_only.startswith("1"):  # US/Canada with country code
-            pass  # Already formatted
-        elif len(digits_only) < 10:
-            raise ValueError(f"Invalid phone number format: {phone}")
-        
-        return digits_only
+        return format_phone_number(phone)
     
     def render_template(
         self,
@@ -80,10 +121,9 @@ class WhatsAppService:
             Rendered content
         """
         try:
-            template = Template(template_content)
-            return template.render(**variables)
+            return render_cached(template_content, variables)
         except Exception as e:
-            logger.error(f"Failed to render WhatsApp template: {str(e)}")
+            logger.error("Failed to render WhatsApp template: %s", e)
             raise ValueError(f"Template rendering failed: {str(e)}")
     
     async def send_message(
@@ -132,37 +172,37 @@ class WhatsAppService:
             # Send message via Evolution API
             url = f"{self.config.api_url}/message/sendText/{self.config.instance_name}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    json=payload,
-                    headers=self._get_headers(),
-                    timeout=30.0
-                )
+            response = await _get_client().post(
+                url,
+                content=orjson.dumps(payload),
+                headers=self._get_headers(),
+                timeout=30.0
+            )
+            
+            if response.status_code == 200:
+                response_data = orjson.loads(response.content)
+                logger.info("WhatsApp message sent successfully to %s", formatted_phone)
+                return {
+                    "success": True,
+                    "message": "WhatsApp message sent successfully",
+                    "status": MessageStatus.SENT,
+                    "recipient": formatted_phone,
+                    "message_id": get_message_id(response_data),
+                    "response": response_data
+                }
+            else:
+                error_msg = f"Evolution API error: {response.status_code} - {response.text}"
+                logger.error("WhatsApp send failed: %s", error_msg)
+                return {
+                    "success": False,
+                    "error": error_msg,
+                    "status": MessageStatus.FAILED,
+                    "recipient": formatted_phone,
+                    "retryable": response.status_code == 429
+                }
                 
-                if response.status_code == 200:
-                    response_data = response.json()
-                    logger.info(f"WhatsApp message sent successfully to {formatted_phone}")
-                    return {
-                        "success": True,
-                        "message": "WhatsApp message sent successfully",
-                        "status": MessageStatus.SENT,
-                        "recipient": formatted_phone,
-                        "message_id": response_data.get("key", {}).get("id"),
-                        "response": response_data
-                    }
-                else:
-                    error_msg = f"Evolution API error: {response.status_code} - {response.text}"
-                    logger.error(f"WhatsApp send failed: {error_msg}")
-                    return {
-                        "success": False,
-                        "error": error_msg,
-                        "status": MessageStatus.FAILED,
-                        "recipient": formatted_phone
-                    }
-                    
         except Exception as e:
-            logger.error(f"Failed to send WhatsApp message to {to_phone}: {str(e)}")
+            logger.error("Failed to send WhatsApp message to %s: %s", to_phone, e)
             return {
                 "success": False,
                 "error": str(e),
@@ -199,7 +239,7 @@ class WhatsAppService:
             )
             
         except Exception as e:
-            logger.error(f"Failed to send template WhatsApp message to {to_phone}: {str(e)}")
+            logger.error("Failed to send template WhatsApp message to %s: %s", to_phone, e)
             return {
                 "success": False,
                 "error": str(e),
@@ -207,6 +247,54 @@ class WhatsAppService:
                 "recipient": to_phone
             }
     
+    async def send_template_message_bulk(
+        self,
+        recipients: List[Dict[str, Any]],
+        template_content: str,
+        variables: Dict[str, Any],
+        concurrency: int = BULK_CONCURRENCY
+    ) -> List[Dict[str, Any]]:
+        """
+        Send a template message to many recipients concurrently
+        
+        The message is rendered once with the shared variables; only
+        recipients that carry their own variables are rendered again.
+        
+        Args:
+            recipients: Dicts with "phone" and optional "variables", which
+                override the shared variables for that recipient
+            template_content: Message template content
+            variables: Variables shared by all recipients
+            concurrency: Maximum number of messages in flight at once
+            
+        Returns:
+            One result dict per recipient, in order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        try:
+            shared_message = self.render_template(template_content, variables)
+        except Exception as e:
+            logger.error("Failed to render bulk WhatsApp template: %s", e)
+            return [{
+                "success": False,
+                "error": str(e),
+                "status": MessageStatus.FAILED,
+                "recipient": recipient.get("phone")
+            } for recipient in recipients]
+        
+        async def send_one(recipient: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                if not recipient.get("variables"):
+                    return await self.send_message(to_phone=recipient["phone"], message=shared_message)
+                return await self.send_template_message(
+                    to_phone=recipient["phone"],
+                    template_content=template_content,
+                    variables={**variables, **recipient["variables"]}
+                )
+        
+        return await asyncio.gather(*(send_one(recipient) for recipient in recipients))
+    
     async def get_instance_status(self) -> Dict[str, Any]:
         """
         Get Evolution API instance status
@@ -223,31 +311,31 @@ class WhatsAppService:
             
             url = f"{self.config.api_url}/instance/connectionState/{self.config.instance_name}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers=self._get_headers(),
-                    timeout=10.0
-                )
+            response = await _get_client().get(
+                url,
+                headers=self._get_headers(),
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                state = get_instance_state(data)
+                return {
+                    "success": True,
+                    "instance_name": self.config.instance_name,
+                    "status": state,
+                    "connected": state == "open",
+                    "response": data
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": f"Failed to get instance status: {response.status_code}",
+                    "instance_name": self.config.instance_name
+                }
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "success": True,
-                        "instance_name": self.config.instance_name,
-                        "status": data.get("instance", {}).get("state"),
-                        "connected": data.get("instance", {}).get("state") == "open",
-                        "response": data
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": f"Failed to get instance status: {response.status_code}",
-                        "instance_name": self.config.instance_name
-                    }
-                    
         except Exception as e:
-            logger.error(f"Failed to get WhatsApp instance status: {str(e)}")
+            logger.error("Failed to get WhatsApp instance status: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -270,30 +358,29 @@ class WhatsAppService:
             
             url = f"{self.config.api_url}/instance/connect/{self.config.instance_name}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers=self._get_headers(),
-                    timeout=10.0
-                )
+            response = await _get_client().get(
+                url,
+                headers=self._get_headers(),
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                return {
+                    "success": True,
+                    "qr_code": data.get("base64"),
+                    "instance_name": self.config.instance_name,
+                    "response": data
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": f"Failed to get QR code: {response.status_code}",
+                    "instance_name": self.config.instance_name
+                }
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "success": True,
-                        "qr_code": data.get("base64"),
-                        "instance_name": self.config.instance_name,
-                        "response": data
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": f"Failed to get QR code: {response.status_code}",
-                        "instance_name": self.config.instance_name
-                    }
-                    
         except Exception as e:
-            logger.error(f"Failed to get WhatsApp QR code: {str(e)}")
+            logger.error("Failed to get WhatsApp QR code: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -304,6 +391,20 @@ class WhatsAppService:
         """
         Validate WhatsApp configuration
         
+        Returns:
+            Dict with validation status and details, computed once at construction
+        """
+        return self._validation
+    
+    def _compute_validation(self) -> Dict[str, Any]:
+        """
+        Check the WhatsApp configuration and build the validate_config result
+        
+        These checks stay here rather than as required-field constraints on
+        the schema: build_whatsapp_config fills missing settings with "", and
+        send_message reports such a config as incomplete instead of the
+        service failing to construct.
+        
         Returns:
             Dict with validation status and details
         """
@@ -355,7 +456,7 @@ class WhatsAppService:
                 }
                 
         except Exception as e:
-            logger.error(f"WhatsApp connection test failed: {str(e)}")
+            logger.error("WhatsApp connection test failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
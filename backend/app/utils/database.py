@@ -1,46 +1,100 @@
 """
 Database utilities for JCI Connect Backend
 """
+from functools import lru_cache
+from typing import Optional
 from supabase import create_client, Client
 from app.core.config import settings
+import asyncpg
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Global Supabase client
-_supabase_client: Client = None
-
 
+@lru_cache(maxsize=1)
 def get_supabase_client() -> Client:
     """
     Get Supabase client instance
     
+    The client is created once per process and shared by every request so the
+    underlying HTTP connection pool (and its keep-alive connections) is reused.
+    Call it at startup so no request pays for (or races on) creating it.
+    
     Returns:
         Supabase client
     """
-    global _supabase_client
+    try:
+        logger.info("Creating Supabase client with URL: %s", settings.supabase_url)
+        
+        # Use the secret key for backend operations
+        client = create_client(
+            settings.supabase_url,
+            settings.supabase_secret_key
+        )
+        logger.info("Supabase client initialized successfully")
+        return client
+    except Exception as e:
+        logger.error("Failed to initialize Supabase client for %s: %s", settings.supabase_url, e)
+        raise
+
+
+# Direct Postgres pool, created at startup when DATABASE_URL is configured
+_postgres_pool: Optional[asyncpg.Pool] = None
+
+
+async def _init_postgres_connection(connection: asyncpg.Connection) -> None:
+    """Decode json/jsonb columns to Python objects, matching the Supabase client"""
+    for type_name in ("json", "jsonb"):
+        await connection.set_type_codec(
+            type_name,
+            encoder=json.dumps,
+            decoder=json.loads,
+            schema="pg_catalog"
+        )
+
+
+async def init_postgres_pool() -> Optional[asyncpg.Pool]:
+    """
+    Create the Postgres connection pool if DATABASE_URL is configured
     
-    if _supabase_client is None:
-        try:
-            logger.info(f"Creating Supabase client with URL: {settings.supabase_url}")
-            logger.info(f"Using secret key: {settings.supabase_secret_key[:20]}...")
-            logger.info(f"Secret key length: {len(settings.supabase_secret_key)}")
-            
-            # Use the secret key for backend operations
-            key = settings.supabase_secret_key
-            
-            _supabase_client = create_client(
-                settings.supabase_url,
-                key
-            )
-            logger.info("Supabase client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Supabase client: {str(e)}")
-            logger.error(f"URL: {settings.supabase_url}")
-            logger.error(f"Key: {settings.supabase_secret_key[:20]}...")
-            raise
+    Returns:
+        Connection pool, or None when direct Postgres access is not configured
+    """
+    global _postgres_pool
+    
+    if _postgres_pool is None and settings.database_url:
+        _postgres_pool = await asyncpg.create_pool(
+            settings.database_url,
+            min_size=settings.database_pool_min_size,
+            max_size=settings.database_pool_max_size,
+            statement_cache_size=settings.database_statement_cache_size,
+            max_inactive_connection_lifetime=settings.database_pool_max_inactive_lifetime,
+            command_timeout=settings.database_command_timeout,
+            init=_init_postgres_connection
+        )
+        logger.info("Postgres connection pool initialized successfully")
+    
+    return _postgres_pool
+
+
+def get_postgres_pool() -> Optional[asyncpg.Pool]:
+    """
+    Get the Postgres connection pool
+    
+    Returns:
+        Connection pool, or None if it has not been initialized
+    """
+    return _postgres_pool
+
+
+async def close_postgres_pool() -> None:
+    """Close the Postgres connection pool"""
+    global _postgres_pool
     
-    return _supabase_client
+    if _postgres_pool is not None:
+        await _postgres_pool.close()
+        _postgres_pool = None
 
 
 # Note: Anon key not needed for backend operations
@@ -0,0 +1,56 @@
+"""
+Evolution API helpers shared by the WhatsApp service and adapter
+"""
+import functools
+import re
+from typing import Any, Optional
+
+_NON_DIGITS_RE = re.compile(r"\D+")
+
+
+@functools.lru_cache(maxsize=50_000)
+def format_phone_number(phone: str) -> str:
+    """
+    Format phone number for WhatsApp (remove non-digits, add country code if needed)
+    
+    Cached because the same contacts are messaged over and over by
+    campaigns, reminders and retries.
+    
+    Args:
+        phone: Phone number to format
+    
+    Returns:
+        Formatted phone number
+    
+    Raises:
+        ValueError: If the number has fewer than 10 digits
+    """
+    # Remove all non-digit characters
+    digits_only = _NON_DIGITS_RE.sub("", phone)
+    length = len(digits_only)
+    
+    # If number doesn't start with country code, assume it's a local number
+    # You might want to customize this based on your default country
+    if length == 10:  # US/Canada local number
+        return "1" + digits_only
+    if length < 10:
+        raise ValueError(f"Invalid phone number format: {phone}")
+    
+    # Already includes a country code
+    return digits_only
+
+
+def get_message_id(response_data: Any) -> Optional[str]:
+    """Get the message ID from an Evolution API send response, if present"""
+    try:
+        return response_data["key"]["id"]
+    except (KeyError, TypeError):
+        return None
+
+
+def get_instance_state(data: Any) -> Optional[str]:
+    """Get the connection state from an Evolution API status response, if present"""
+    try:
+        return data["instance"]["state"]
+    except (KeyError, TypeError):
+        return None
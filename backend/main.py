@@ -2,6 +2,7 @@
 JCI Connect Backend API
 FastAPI application for handling communication services
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -10,6 +11,11 @@ import uvicorn
 
 from app.core.config import settings
 from app.interfaces.api.communication import router as communication_router
+from app.interfaces.api.dependencies import get_message_log_writer, get_email_adapter, get_whatsapp_adapter
+from app.infrastructure.database.client import get_supabase_client
+from app.utils.database import init_postgres_pool, close_postgres_pool, get_supabase_client as get_legacy_supabase_client
+from app.services.whatsapp_service import close_http_client as close_whatsapp_service_client
+from app.api.communication import close_email_services
 
 # Configure logging
 logging.basicConfig(
@@ -18,13 +24,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    # Create shared clients before serving so the first requests don't race to
+    # build them (or pay for it); the legacy router has its own client
+    get_supabase_client()
+    get_legacy_supabase_client()
+    await init_postgres_pool()
+    message_log_writer = get_message_log_writer()
+    message_log_writer.start()
+    yield
+    await message_log_writer.stop()
+    await get_whatsapp_adapter().aclose()
+    await get_email_adapter().close()
+    await close_whatsapp_service_client()
+    await close_email_services()
+    await close_postgres_pool()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="Backend API for JCI Connect communication services",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
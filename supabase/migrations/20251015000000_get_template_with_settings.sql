@@ -0,0 +1,39 @@
+-- =====================================================
+-- GET TEMPLATE WITH SETTINGS
+-- Migration: Fetch a message template and organization settings in one call
+-- Date: 2025-10-15
+-- Purpose: Let the backend resolve /send-message inputs with a single RPC
+--          instead of two sequential REST round-trips
+-- =====================================================
+
+-- Returns {"template": {...} | null, "settings": {...} | null}
+-- Only the columns needed to send a message are included
+CREATE OR REPLACE FUNCTION public.get_template_with_settings(p_id UUID)
+RETURNS JSONB AS $$
+  SELECT jsonb_build_object(
+    'template', (
+      SELECT jsonb_build_object(
+        'id', t.id,
+        'type', t.type,
+        'content', t.content,
+        'subject', t.subject
+      )
+      FROM public.message_templates t
+      WHERE t.id = p_id
+    ),
+    'settings', (
+      SELECT jsonb_build_object(
+        'email_config', to_jsonb(s) -> 'email_config',
+        'whatsapp_config', to_jsonb(s) -> 'whatsapp_config'
+      )
+      FROM public.organization_settings s
+      LIMIT 1
+    )
+  );
+$$ LANGUAGE sql STABLE SECURITY INVOKER SET search_path = '';
+
+-- The result includes SMTP and Evolution API credentials, so only the
+-- service role (which bypasses RLS) may call it; Supabase grants EXECUTE
+-- to anon and authenticated by default
+REVOKE EXECUTE ON FUNCTION public.get_template_with_settings(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.get_template_with_settings(UUID) TO service_role;
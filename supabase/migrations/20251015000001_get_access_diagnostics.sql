@@ -0,0 +1,35 @@
+-- =====================================================
+-- ACCESS DIAGNOSTICS
+-- Migration: Collect profiles/RLS access diagnostics in a single call
+-- Date: 2025-10-15
+-- Purpose: Replace the sequential probe queries behind /test-profiles
+--          with one server-side function
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION public.get_access_diagnostics()
+RETURNS JSONB AS $$
+BEGIN
+  -- Runs with SECURITY DEFINER, so counts are not filtered by RLS
+  RETURN jsonb_build_object(
+    'request_role', auth.role(),
+    'definer_role', current_user,
+    'profiles_count', (SELECT COUNT(*) FROM public.profiles),
+    'auth_users_count', (SELECT COUNT(*) FROM auth.users),
+    'profiles_rls_enabled', (
+      SELECT c.relrowsecurity
+      FROM pg_class c
+      WHERE c.oid = 'public.profiles'::regclass
+    ),
+    'profiles_policies', (
+      SELECT COALESCE(jsonb_agg(p.policyname ORDER BY p.policyname), '[]'::jsonb)
+      FROM pg_policies p
+      WHERE p.schemaname = 'public' AND p.tablename = 'profiles'
+    )
+  );
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER SET search_path = '';
+
+-- Counts and policy names must not reach anon or authenticated clients,
+-- which Supabase grants EXECUTE by default
+REVOKE EXECUTE ON FUNCTION public.get_access_diagnostics() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.get_access_diagnostics() TO service_role;
@@ -0,0 +1,19 @@
+-- =====================================================
+-- MESSAGE LOGS TEMPLATE NAME
+-- Migration: Store the template name on each message log
+-- Date: 2025-10-16
+-- Purpose: Let log listings show which template was sent without joining
+--          (or looking up) message_templates per row; the name is a
+--          snapshot, so it also survives template renames and deletes
+-- =====================================================
+
+ALTER TABLE public.message_logs ADD COLUMN IF NOT EXISTS template_name TEXT;
+
+COMMENT ON COLUMN public.message_logs.template_name IS 'Template name at the time the message was sent';
+
+-- Backfill existing logs from their templates
+UPDATE public.message_logs l
+SET template_name = t.name
+FROM public.message_templates t
+WHERE l.template_id = t.id
+  AND l.template_name IS NULL;